@@ -2,8 +2,8 @@ from __future__ import annotations
 from os import get_terminal_size
 from sys import stdout
 from typing import Any, Callable, Iterable, Literal, overload
-from conterm.control.actions import erase_display, move_to, pos
-from conterm.control import Key, Listener
+from conterm.control.actions import pos
+from conterm.control import Key, Listener, keys as key_codes
 
 from conterm.pretty.markup import Markup
 
@@ -15,12 +15,40 @@ __all__ = [
 
 scolor = "green"
 
+def _clear_(line: int) -> str:
+    """Ansi sequence that moves to the start of the line and erases everything after it."""
+    return f"\x1b[{line};0H\x1b[0J"
+
 def clear(line):
     """Clear select text."""
-    move_to(0, line)
-    erase_display(0)
-
-def _yes_no_(prompt, keep, color, title):
+    stdout.write(_clear_(line))
+    stdout.flush()
+
+def _redraw_line_(row: int, text: str) -> str:
+    """Ansi sequence that replaces the contents of an absolute row with the given text."""
+    return f"\x1b[{row};0H\x1b[2K{text}"
+
+_SELECT_ACTIONS_ = {
+    key_codes.by_chord(chord): action
+    for action, chords in (
+        ("down", ("j", "down")),
+        ("up", ("k", "up")),
+        ("toggle", (" ",)),
+        ("submit", ("enter",)),
+    )
+    for chord in chords
+}
+"""Select action for each key code. Handlers pick the action with one lookup instead of
+comparing the key against every chord."""
+
+def _indices_(mask: int):
+    """Yield the index of every set bit in the mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def _yes_no_(prompt, keep, color, title, for_prompt):
     start = pos()[1]
     def write(_):
         stdout.write(prompt + "[Y/n] ")
@@ -48,55 +76,76 @@ def _yes_no_(prompt, keep, color, title):
         clear(start)
 
     if color and keep:
-        Markup.print(f"[242]{title or prompt} [{scolor}]{'yes' if state['result'] else 'no'}")
+        Markup.print(
+            f"[242]{title or prompt} [{scolor}]{'yes' if state['result'] else 'no'}",
+            for_prompt=for_prompt,
+        )
 
     return state["result"]
 
-def _uinput_(prompt, default, keep, color, password, title):
+def _uinput_(prompt, default, keep, color, password, title, for_prompt):
     start = pos()[1]
 
-    def write(result, hide: bool):
+    erase = _clear_(start)
+
+    def write(buffer: list[str], hide: bool, clear: bool = False):
+        prefix = erase if clear else ""
         if password:
-            stdout.write(f"{prompt} {'*' * len(result) if hide else result}\n[alt+h = show/hide]")
+            result = '*' * len(buffer) if hide else "".join(buffer)
+            stdout.write(f"{prefix}{prompt} {result}\n[alt+h = show/hide]")
             stdout.flush()
         else:
-            stdout.write(f"{prompt} {result}")
+            stdout.write(f"{prefix}{prompt} {''.join(buffer)}")
             stdout.flush()
 
     def on_key(event, state):
         if event == "enter":
             return False
         elif event == "backspace":
-            state["result"] = state["result"][:-1]
-            clear(start)
-            write(state["result"], state["hide"])
+            if state["buffer"]:
+                state["buffer"].pop()
+            write(state["buffer"], state["hide"], clear=True)
         elif event == "alt+h" and password:
             state["hide"] = not state["hide"] 
-            clear(start)
-            write(state["result"], state["hide"])
-        elif len(str(event)) == 1:
-            state["result"] += str(event)
-            clear(start)
-            write(state["result"], state["hide"])
+            write(state["buffer"], state["hide"], clear=True)
+        else:
+            char = str(event)
+            if len(char) == 1:
+                state["buffer"].append(char)
+                write(state["buffer"], state["hide"], clear=True)
 
+    # Typed characters are collected in a list and only joined when displayed
     state = {
-        "result": default,
+        "buffer": list(default),
         "hide": password
     }
 
-    write(state["result"], state["hide"])
+    write(state["buffer"], state["hide"])
     with Listener(on_key=on_key, state=state) as listener:
         listener.join()
+    state["result"] = "".join(state["buffer"])
 
     if not keep or color:
         clear(start)
 
     if color and keep:
-        Markup.print(f"[242]{title or prompt} [{scolor}]{'*' * len(state['result']) if password else state['result']}")
+        Markup.print(
+            f"[242]{title or prompt} [{scolor}]{'*' * len(state['result']) if password else state['result']}",
+            for_prompt=for_prompt,
+        )
 
     return state["result"]
 
-def prompt(_prompt: str, *, password: bool = False, default: str = "", title: str | None = None, keep: bool = True, color: bool = True) -> str | bool:
+def prompt(
+    _prompt: str,
+    *,
+    password: bool = False,
+    default: str = "",
+    title: str | None = None,
+    keep: bool = True,
+    color: bool = True,
+    for_prompt: bool = False,
+) -> str | bool:
     """Prompt the user for input. This can either be text or Yes/no.
 
     Args:
@@ -106,6 +155,8 @@ def prompt(_prompt: str, *, password: bool = False, default: str = "", title: st
             This will hide all input but still collect what is entered.
         keep (bool): Whether to erase the prompt/input after it is submitted
         color (bool): Whether to color the result when it is displayed
+        for_prompt (bool): Wrap the ansi codes in the colored result in `\\x01` and `\\x02`
+            so readline style prompts don't count them towards the line length.
     """
     _prompt = _prompt.strip()
     if not _prompt.endswith((":", "?")):
@@ -114,9 +165,9 @@ def prompt(_prompt: str, *, password: bool = False, default: str = "", title: st
     yes_no = _prompt.endswith("?")
 
     if yes_no:
-        return _yes_no_(_prompt, keep, color, title)
+        return _yes_no_(_prompt, keep, color, title, for_prompt)
     else:
-        return _uinput_(_prompt, default, keep, color, password, title)
+        return _uinput_(_prompt, default, keep, color, password, title, for_prompt)
 
 @overload
 def select(
@@ -130,7 +181,8 @@ def select(
     color: str = "yellow",
     title: str | None = None,
     icons: tuple[str, str] = ("○", "◉"),
-    help: bool = True
+    help: bool = True,
+    for_prompt: bool = False,
 ) -> str:
     ...
 
@@ -146,7 +198,8 @@ def select(
     color: str = "yellow",
     title: str | None = None,
     icons: tuple[str, str] = ("○", "◉"),
-    help: bool = True
+    help: bool = True,
+    for_prompt: bool = False,
 ) -> tuple[str, Any]:
     ...
 
@@ -161,7 +214,8 @@ def select(
     color: str = "yellow",
     title: str | None = None,
     icons: tuple[str, str] = ("○", "◉"),
-    help: bool = True
+    help: bool = True,
+    for_prompt: bool = False,
 ) -> str | tuple[str, Any]:
     """Select (radio) terminal input.
 
@@ -175,6 +229,8 @@ def select(
         title (str | None): The text to use when displaying the selection option(s).
         icons (tuple[str, str]): Icons for not selected and selected respectively.
         help (bool): Whether to print select help info at bottom of print.
+        for_prompt (bool): Wrap the ansi codes in the submitted result in `\\x01` and `\\x02`
+            so readline style prompts don't count them towards the line length.
 
     Returns:
         Filtered list[str] if list[str] was provided as options.
@@ -182,25 +238,53 @@ def select(
     """
     start = pos()[1]
     page_size = min(page_size or 5, get_terminal_size().lines - 3)
+    # Options are only read, never changed, so their shape is resolved once
+    is_dict = isinstance(options, dict)
+    keys = tuple(options)
+    n = len(keys)
 
     if default is None:
         default = 0
     elif isinstance(default, str):
-        if isinstance(options, list):
-            default = options.index(default)
-        else:
-            default = list(options.keys()).index(default)
+        default = keys.index(default)
 
-    bpad = min(len(options) - 1, default + page_size - 1)
+    bpad = min(n - 1, default + page_size - 1)
     tpad = max(0, default - (page_size - 1 - (bpad - default)))
 
     padding = [tpad, bpad]
-    keys = [key for key in (options if isinstance(options, list) else options.keys())]
 
-    def write(line: int, padding: list[int]):
+    # Options never change while selecting so render each variant (unfocused, focused) once
+    rendered = []
+    for option in keys:
+        option = preprocess(option) if preprocess is not None else option
+        if style == "icon":
+            rendered.append((Markup.parse(f"{icons[0]} {option}"), Markup.parse(f"{icons[1]} {option}")))
+        else:
+            rendered.append((Markup.parse(f"  {option}"), Markup.parse(f"  [{color}]{option}")))
+
+    # The style can't change while selecting so the line renderer is picked once
+    if style == "icon":
+        def option_line(i: int, line: int, padding: list[int]) -> str:
+            """Get the text for a single option."""
+            symbol = " "
+            if i == padding[0] and padding[0] > 0:
+                symbol = '↑'
+            elif i == padding[1] and padding[1] < n - 1:
+                symbol = '↓'
+            return f"{symbol} {rendered[i][int(line == i)]}"
+    else:
+        def option_line(i: int, line: int, padding: list[int]) -> str:
+            """Get the text for a single option."""
+            return rendered[i][int(line == i)]
+
+    erase = _clear_(start)
+
+    def write(line: int, padding: list[int], clear: bool = False):
         """Print prompt, select options, and help."""
+        # Build the entire frame and emit it with a single write
+        lines = []
         if prompt != "":
-            print(prompt)
+            lines.append(prompt)
 
         if line > padding[1]:
             padding[0] += 1
@@ -209,41 +293,45 @@ def select(
             padding[0] = max(0, padding[0] - 1)
             padding[1] = max(page_size - 1, padding[1] - 1)
 
-        if style == "icon":
-            for i, option in enumerate(keys):
-                if i >= padding[0] and i <= padding[1]:
-                    option = preprocess(option) if preprocess is not None else option
-                    symbol = " "
-                    if i == padding[0] and padding[0] > 0:
-                        symbol = '↑'
-                    elif i == padding[1] and padding[1] < len(options) - 1:
-                        symbol = '↓'
-                    Markup.print(f"{symbol} {icons[int(line == i)]} {option}")
-        else:
-            for i, option in enumerate(keys):
-                if i >= padding[0] and i <= padding[1]:
-                    option = preprocess(option) if preprocess is not None else option
-                    Markup.print(f"  {f'[{color}]' if i == line else ''}{option}")
+        lines.extend(option_line(i, line, padding) for i in range(padding[0], min(padding[1], n - 1) + 1))
 
         if help:
-            print("\n[enter = Submit]")
+            lines.extend(("", "[enter = Submit]"))
+
+        stdout.write((erase if clear else "") + "\n".join(lines) + "\n")
+        stdout.flush()
+
+    def redraw(line: int, padding: list[int], *changed: int):
+        """Rewrite only the changed options. Everything is redrawn if the
+        focused line has scrolled out of view.
+        """
+        if line < padding[0] or line > padding[1]:
+            write(line, padding, clear=True)
+            return
+
+        top = start + int(prompt != "") - padding[0]
+        stdout.write(
+            "\x1b[s"
+            + "".join(_redraw_line_(top + i, option_line(i, line, padding)) for i in changed)
+            + "\x1b[u"
+        )
+        stdout.flush()
 
     def on_key(event: Key, state: dict):
         """Manipulate state based on key events.
         
         j and down increment the line, k and up decrement the line, and enter submits the selection.
         """
-        if event == "j" or event == "down":
-            if state['line'] < len(options) - 1:
+        action = _SELECT_ACTIONS_.get(event.code)
+        if action == "down":
+            if state['line'] < n - 1:
                 state['line'] += 1
-                clear(start)
-                write(state['line'], state["padding"])
-        elif event == "k" or event == "up":
+                redraw(state['line'], state["padding"], state['line'] - 1, state['line'])
+        elif action == "up":
             if state['line'] > 0:
                 state['line'] -= 1
-                clear(start)
-                write(state['line'], state["padding"])
-        elif event == "enter":
+                redraw(state['line'], state["padding"], state['line'] + 1, state['line'])
+        elif action == "submit":
             return False
     
     state = {
@@ -259,14 +347,10 @@ def select(
     clear(start)
     prompt = prompt if prompt != "" else "\\[SELECT]:"
 
-    if isinstance(options, dict):
-        selection = list(options.keys())[state['line']]
-        result = selection, options[selection] 
-    else:
-        selection = options[state['line']]
-        result = selection
+    selection = keys[state['line']]
+    result = (selection, options[selection]) if is_dict else selection
 
-    Markup.print(f"[242]{title or prompt} [{scolor}]{selection}")
+    Markup.print(f"[242]{title or prompt} [{scolor}]{selection}", for_prompt=for_prompt)
     return result 
 
 
@@ -284,6 +368,7 @@ def multi_select(
     icons: tuple[str, str] = ("□", "▣"),
     allow_empty: bool = False,
     help: bool = True,
+    for_prompt: bool = False,
 ) -> dict[str, str]:
     ...
 
@@ -300,7 +385,8 @@ def multi_select(
     title: str | None = None,
     icons: tuple[str, str] = ("□", "▣"),
     allow_empty: bool = False,
-    help: bool = True
+    help: bool = True,
+    for_prompt: bool = False,
 ) -> list[str]:
     ...
 
@@ -316,7 +402,8 @@ def multi_select(
     title: str | None = None,
     icons: tuple[str, str] = ("□", "▣"),
     allow_empty: bool = False,
-    help: bool = True
+    help: bool = True,
+    for_prompt: bool = False,
 ) -> list[str] | dict[str, Any]:
     """Multi select (radio) terminal input.
     
@@ -329,6 +416,8 @@ def multi_select(
         icons (tuple[str, str]): Icons for not selected and selected respectively.
         allow_empty (bool): Whether to allow user to submit empty results. Defaults to False.
         help (bool): Whether to print multi select help info at bottom of print.
+        for_prompt (bool): Wrap the ansi codes in the submitted result in `\\x01` and `\\x02`
+            so readline style prompts don't count them towards the line length.
 
     Returns:
         Filtered list[str] if list[str] was provided as options.
@@ -337,14 +426,29 @@ def multi_select(
     start = pos()[1]
     page_size = min(page_size if page_size is not None else 5, get_terminal_size().lines - 3)
 
-    def get_default_index(default: str) -> int:
-        if isinstance(options, list):
-            return options.index(default)
+    # Options are only read, never changed, so their shape is resolved once
+    is_dict = isinstance(options, dict)
+    keys = tuple(options)
+    n = len(keys)
+    selected = [keys.index(default) for default in defaults or []]
+
+    # Options never change while selecting so render each variant once. Variants are
+    # indexed by `(selected << 1) | focused`.
+    rendered = []
+    for option in keys:
+        option = preprocess(option) if preprocess is not None else option
+        if style == "icon":
+            rendered.append(tuple(
+                Markup.parse(f"{icons[checked]} {'[yellow]' if focused else ''}{option}")
+                for checked in (0, 1)
+                for focused in (False, True)
+            ))
         else:
-            return list(options.keys()).index(default)
-
-    selected = [get_default_index(default) for default in defaults or []]
-    keys = [key for key in (options if isinstance(options, list) else options.keys())]
+            rendered.append(tuple(
+                Markup.parse(f"{f'[{color}]' if checked else ''}{'[b]' if focused else ''}{option}")
+                for checked in (False, True)
+                for focused in (False, True)
+            ))
 
     bpad = page_size - 1
     tpad = 0
@@ -352,14 +456,32 @@ def multi_select(
 
     if len(selected) > 0:
         default = selected[0]
-        bpad = min(len(options) - 1, default + page_size - 1)
+        bpad = min(n - 1, default + page_size - 1)
         tpad = max(0, default - (page_size - 1 - (bpad - default)))
     padding = [tpad, bpad]
     
-    def write(line: int, state):
+    def option_line(i: int, line: int, state) -> str:
+        """Get the text for a single option."""
+        symbol = " "
+        if i == state['padding'][0] and state['padding'][0] > 0:
+            symbol = '↑'
+        elif i == state['padding'][1] and state['padding'][1] < n - 1:
+            symbol = '↓'
+        return f"{symbol} {rendered[i][((state['selected'] >> i & 1) << 1) | int(i == line)]}"
+
+    def summary(state) -> str:
+        """Get the list of selected options shown when not all options fit on the page."""
+        selected_options = ', '.join(f'\x1b[33m{keys[i]}\x1b[39m' for i in _indices_(state['selected']))
+        return f"[{selected_options}]"
+
+    erase = _clear_(start)
+
+    def write(line: int, state, clear: bool = False):
         """Print prompt, select options, and help."""
+        # Build the entire frame and emit it with a single write
+        lines = []
         if prompt != "":
-            print(prompt)
+            lines.append(prompt)
 
         if line > state['padding'][1]:
             state['padding'][0] += 1
@@ -368,75 +490,78 @@ def multi_select(
             state['padding'][0] = max(0, state['padding'][0] - 1)
             state['padding'][1] = max(page_size - 1, state['padding'][1] - 1)
 
-        if style == "icon":
-            for i, option in enumerate(keys):
-                if i >= state['padding'][0] and i <= state['padding'][1]:
-                    option = preprocess(option) if preprocess is not None else option
-                    symbol = " "
-                    if i == state['padding'][0] and state['padding'][0] > 0:
-                        symbol = '↑'
-                    elif i == state['padding'][1] and state['padding'][1] < len(options) - 1:
-                        symbol = '↓'
-                    Markup.print(f"{symbol} {icons[int(i in state['selected'])]} {'[yellow]' if i == line else ''}{option}")
-        else:
-            for i, option in enumerate(keys):
-                if i >= state['padding'][0] and i <= state['padding'][1]:
-                    option = preprocess(option) if preprocess is not None else option
-                    symbol = " "
-                    if i == state['padding'][0] and state['padding'][0] > 0:
-                        symbol = '↑'
-                    elif i == state['padding'][1] and state['padding'][1] < len(options) - 1:
-                        symbol = '↓'
-                    Markup.print(f"{symbol} {f'[{color}]'if i in state['selected'] else ''}{'[b]' if i == line else ''}{option}")
-
-        print()
-        if len(options) > page_size:
-            selected_options = ', '.join(f'\x1b[33m{keys[i]}\x1b[39m' for i in state['selected'])
-            print(f"[{selected_options}]")
+        lines.extend(
+            option_line(i, line, state)
+            for i in range(state['padding'][0], min(state['padding'][1], n - 1) + 1)
+        )
+
+        lines.append("")
+        if n > page_size:
+            lines.append(summary(state))
         if help:
             msg = "[space = select, enter = Submit]"
             if "msg" in state and state['msg'] != "":
                 msg = f"{state['msg']}\n[space = select, enter = Submit]"
-            print(msg)
+            lines.append(msg)
+
+        stdout.write((erase if clear else "") + "\n".join(lines) + "\n")
+        stdout.flush()
+
+    def redraw(line: int, state, *changed: int):
+        """Rewrite only the changed options and the selected summary. Everything is
+        redrawn if the focused line has scrolled out of view.
+        """
+        if line < state['padding'][0] or line > state['padding'][1]:
+            write(line, state, clear=True)
+            return
+
+        top = start + int(prompt != "") - state['padding'][0]
+        frame = ["\x1b[s"]
+        frame.extend(_redraw_line_(top + i, option_line(i, line, state)) for i in changed)
+        if n > page_size:
+            # Summary comes after the last option and a blank line
+            frame.append(_redraw_line_(top + state['padding'][1] + 2, summary(state)))
+        frame.append("\x1b[u")
+        stdout.write("".join(frame))
+        stdout.flush()
 
     def on_key(event: Key, state: dict):
         """Manipulate state based on key events.
         
         j and down increment the line, k and up decrement the line, and enter submits the selection.
         """
-        if event == "j" or event == "down":
-            if state['line'] < len(options) - 1:
+        action = _SELECT_ACTIONS_.get(event.code)
+        if action == "down":
+            if state['line'] < n - 1:
                 state['line'] += 1
-            clear(start)
-            write(state['line'], state)
-        elif event == "k" or event == "up":
+                redraw(state['line'], state, state['line'] - 1, state['line'])
+        elif action == "up":
             if state['line'] > 0:
                 state['line'] -= 1
-            clear(start)
-            write(state['line'], state)
-        elif event == " ":
-            if state['line'] in state['selected']:
-                state['selected'].remove(state['line'])
-            else:
-                state['selected'].add(state['line'])
-            clear(start)
-            write(state['line'], state)
-        elif event == "enter":
-            if not allow_empty and len(state['selected']) == 0:
-                clear(start)
+                redraw(state['line'], state, state['line'] + 1, state['line'])
+        elif action == "toggle":
+            state['selected'] ^= 1 << state['line']
+            redraw(state['line'], state, state['line'])
+        elif action == "submit":
+            if not allow_empty and state['selected'] == 0:
                 state['msg'] = "\x1b[31;1mMust select at least one option\x1b[39;22m"
-                write(state['line'], state)
+                write(state['line'], state, clear=True)
             else:
                 return False
 
+    # Selected options are tracked as a bitmask where bit `i` is option `i`
+    mask = 0
+    for i in selected:
+        mask |= 1 << i
+
     state = {
         "line": default,
-        "selected": set(selected),
+        "selected": mask,
         "padding": padding
     }
 
     #custom select print
-    write(0, state)
+    write(state['line'], state)
 
     with Listener(on_key=on_key, state=state) as listener:
         listener.join()
@@ -444,13 +569,11 @@ def multi_select(
     clear(start)
     prompt = prompt if prompt != "" else "\\[MULTI SELECT]:"
 
-    if isinstance(options, dict):
-        selection = list(options.keys())
-        selection = [selection[option] for option in state['selected']]
-        result = {key: value for key, value in options.items() if key in selection} 
-    else:
-        selection = [options[line] for line in state["selected"]]
-        result = selection
+    selection = [keys[line] for line in _indices_(state["selected"])]
+    result = {key: options[key] for key in selection} if is_dict else selection
     
-    Markup.print(f"[242]{title or prompt}[/] \\[{', '.join(f'[{scolor}]{opt}[/]' for opt in selection)}]")
-    return selection
+    Markup.print(
+        f"[242]{title or prompt}[/] \\[{', '.join(f'[{scolor}]{opt}[/]' for opt in selection)}]",
+        for_prompt=for_prompt,
+    )
+    return result
@@ -1,40 +1,49 @@
 from __future__ import annotations
 from os import get_terminal_size
 
+import os
 import sys
-from collections.abc import Callable
-from dataclasses import dataclass
-from queue import Queue
+import unicodedata
+from collections import deque
+from collections.abc import Callable, Sequence
 from threading import Event, Lock, Thread
-from time import sleep
+from time import perf_counter
 from typing import Literal
 
-from conterm.control.actions import move_to, pos, up
+from conterm.control.actions import pos
 
 __all__ = ["Icons", "TaskManager", "Spinner", "Progress", "Task"]
 
+# Only one manager can own and redirect stdout at a time
+_MANAGER_LOCK_ = Lock()
+
+# Shortest time between frames when the manager is woken early. Bursts of output are
+# collected into one frame instead of a frame per write
+_MIN_FRAME_ = 1 / 60
+
 
-@dataclass
 class Icons:
     """Predefined loading spinner icons."""
 
-    DOTS = "⣾⣽⣻⢿⡿⣟⣯⣷"
-    BOUNCE = "⠁⠂⠄⡀⢀⠠⠐⠈"
-    VERTICAL = "▁▂▃▄▅▆▇█▇▆▅▄▃▁"
-    HORIZONTAL = "▉▊▋▌▍▎▏▎▍▌▋▊▉"
-    ARROW = "←↖↑↗→↘↓↙"
-    BOX = "▖▘▝▗"
-    CROSS = "┤┘┴└├┌┬┐"
-    ELLIPSE = [".", "..", "..."]
-    EXPLODE = ".oO@*"
-    DIAMOND = "◇◈◆"
-    STACK = "⡀⡁⡂⡃⡄⡅⡆⡇⡈⡉⡊⡋⡌⡍⡎⡏⡐⡑⡒⡓⡔⡕⡖⡗⡘⡙⡚⡛⡜⡝⡞⡟⡠⡡⡢⡣⡤⡥⡦⡧⡨⡩⡪⡫⡬⡭⡮⡯⡰⡱⡲⡳⡴⡵⡶⡷⡸⡹⡺⡻⡼⡽⡾⡿⢀⢁⢂⢃⢄⢅⢆⢇⢈⢉⢊⢋⢌⢍⢎⢏⢐⢑⢒⢓⢔⢕⢖⢗⢘⢙⢚⢛⢜⢝⢞⢟⢠⢡⢢⢣⢤⢥⢦⢧⢨⢩⢪⢫⢬⢭⢮⢯⢰⢱⢲⢳⢴⢵⢶⢷⢸⢹⢺⢻⢼⢽⢾⢿⣀⣁⣂⣃⣄⣅⣆⣇⣈⣉⣊⣋⣌⣍⣎⣏⣐⣑⣒⣓⣔⣕⣖⣗⣘⣙⣚⣛⣜⣝⣞⣟⣠⣡⣢⣣⣤⣥⣦⣧⣨⣩⣪⣫⣬⣭⣮⣯⣰⣱⣲⣳⣴⣵⣶⣷⣸⣹⣺⣻⣼⣽⣾⣿"
-    TRIANGLE = "◢◣◤◥"
-    SQUARE = "◰◳◲◱"
-    QUARTER_CIRCLE = "◴◷◶◵"
-    HALF_CIRCLE = "◐◓◑◒"
-    CLASSIC = "◜◝◞◟"
-    FISH = [
+    __slots__ = ()
+
+    DOTS = tuple("⣾⣽⣻⢿⡿⣟⣯⣷")
+    BOUNCE = tuple("⠁⠂⠄⡀⢀⠠⠐⠈")
+    VERTICAL = tuple("▁▂▃▄▅▆▇█▇▆▅▄▃▁")
+    HORIZONTAL = tuple("▉▊▋▌▍▎▏▎▍▌▋▊▉")
+    ARROW = tuple("←↖↑↗→↘↓↙")
+    BOX = tuple("▖▘▝▗")
+    CROSS = tuple("┤┘┴└├┌┬┐")
+    ELLIPSE = (".", "..", "...")
+    EXPLODE = tuple(".oO@*")
+    DIAMOND = tuple("◇◈◆")
+    STACK = tuple("⡀⡁⡂⡃⡄⡅⡆⡇⡈⡉⡊⡋⡌⡍⡎⡏⡐⡑⡒⡓⡔⡕⡖⡗⡘⡙⡚⡛⡜⡝⡞⡟⡠⡡⡢⡣⡤⡥⡦⡧⡨⡩⡪⡫⡬⡭⡮⡯⡰⡱⡲⡳⡴⡵⡶⡷⡸⡹⡺⡻⡼⡽⡾⡿⢀⢁⢂⢃⢄⢅⢆⢇⢈⢉⢊⢋⢌⢍⢎⢏⢐⢑⢒⢓⢔⢕⢖⢗⢘⢙⢚⢛⢜⢝⢞⢟⢠⢡⢢⢣⢤⢥⢦⢧⢨⢩⢪⢫⢬⢭⢮⢯⢰⢱⢲⢳⢴⢵⢶⢷⢸⢹⢺⢻⢼⢽⢾⢿⣀⣁⣂⣃⣄⣅⣆⣇⣈⣉⣊⣋⣌⣍⣎⣏⣐⣑⣒⣓⣔⣕⣖⣗⣘⣙⣚⣛⣜⣝⣞⣟⣠⣡⣢⣣⣤⣥⣦⣧⣨⣩⣪⣫⣬⣭⣮⣯⣰⣱⣲⣳⣴⣵⣶⣷⣸⣹⣺⣻⣼⣽⣾⣿")
+    TRIANGLE = tuple("◢◣◤◥")
+    SQUARE = tuple("◰◳◲◱")
+    QUARTER_CIRCLE = tuple("◴◷◶◵")
+    HALF_CIRCLE = tuple("◐◓◑◒")
+    CLASSIC = tuple("◜◝◞◟")
+    FISH = (
         ">))'>",
         " >))'>",
         "  >))'>",
@@ -43,22 +52,48 @@ class Icons:
         "   <'((<",
         "  <'((<",
         " <'((<",
-    ]
+    )
 
 
 class Output:
-    def __init__(self) -> None:
-        self.lock = Lock()
-        self.messages = Queue()
+    __slots__ = ("messages", "wake")
+
+    def __init__(self, wake: Event | None = None) -> None:
+        # deque append and popleft are atomic so writers and the drain don't need a lock
+        self.messages = deque()
+        self.wake = wake
 
     def write(self, text: str):
-        with self.lock:
-            self.messages.put(text)
+        self.messages.append(text)
+        if self.wake is not None:
+            self.wake.set()
+
+    def drain(self) -> list[str]:
+        """Take all messages written since the last drain."""
+        messages = []
+        try:
+            while True:
+                messages.append(self.messages.popleft())
+        except IndexError:
+            pass
+        return messages
 
     def flush(self):
         pass
 
 
+def _width_(text: str) -> int:
+    """Number of terminal columns the text takes up. Wide east asian characters take two
+    columns and combining characters take none.
+    """
+    width = 0
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in "WF" else 1
+    return width
+
+
 def fileno(file_or_fd):
     fd = getattr(file_or_fd, "fileno", lambda: file_or_fd)()
     if not isinstance(fd, int):
@@ -68,6 +103,8 @@ def fileno(file_or_fd):
 
 class TaskManager(Thread):
     def __init__(self, *tasks: Task, clear: bool = False) -> None:
+        self._out_ = None
+
         # Prep the terminal. If starting at bottom of buffer placement depends on scrolling
         (self._cols_, self._lines_) = get_terminal_size()
 
@@ -75,54 +112,101 @@ class TaskManager(Thread):
         self.__tasks__ = list(tasks)
         self.__lock__ = Lock()
         self.__stop__ = Event()
+        self.__wake__ = Event()
         self._rate_ = 0.1
         _, self._y_ = pos()
         self.exc = None
         self.clear = clear
 
-        self._out_ = sys.stdout
-        sys.stdout = Output()
+        # stdout is only taken over once the manager is started
+        self._fd_ = None
+        self._capture_ = Output(self.__wake__)
 
         self.messages = []
+        # Rows of task output from the last frame
+        self._drawn_: list[str] | None = None
+
+    def start(self):
+        if not _MANAGER_LOCK_.acquire(blocking=False):
+            raise ValueError("Only one TaskManager can be active at a time")
+        self._out_ = sys.stdout
+        try:
+            self._fd_ = self.__raw_fd__(self._out_)
+            sys.stdout = self._capture_
+            Thread.start(self)
+        except BaseException:
+            self.__restore__()
+            raise
 
     def run(self):
         try:
+            last = perf_counter()
             while not self.__stop__.is_set():
                 self.__lock__.acquire()
 
-                while sys.stdout.messages.qsize() > 0:
-                    self.messages.append(sys.stdout.messages.get())
+                # Frames can be drawn early so tasks advance by the real time since the last one
+                now = perf_counter()
+                elapsed, last = now - last, now
 
-                # Got to first line of manager then overwrite
-                move_to(0, self._y_)
+                captured = self._capture_.drain()
+                self.messages.extend(captured)
 
                 y = 1
-                self._out_.write("\n")
-
+                tasks = []
                 for task in self.__tasks__:
-                    task.update(self._rate_)
+                    task.update(elapsed)
                     t = str(task)
                     y += t.count("\n")
                     y += max((len(t) // self._cols_) - 1, 0)
                     y += 1
-                    self._out_.write(f"{task}\n")
-
-                if len(self.messages) > 0:
-                    messages = "".join(self.messages)
-                    self._out_.write("\x1b[1m[stdout]\x1b[22m\n")
-                    self._out_.write(messages)
-                    y += messages.count("\n") + 1
-                    for line in messages.split("\n"):
-                        y += max((len(line) // self._cols_) - 1, 0)
-
-                # Track how many lines are printed and if the buffers scrolls then
-                # move the jump y position up by the difference
-                if self._y_ + y > self._lines_:
-                    self._y_ = max(self._y_ - ((self._y_ + y) - self._lines_), 0)
-
-                self._out_.flush()
+                    tasks.append(t)
+                rows = "\n".join(tasks).split("\n")
+
+                if (
+                    not captured
+                    and self._drawn_ is not None
+                    and len(rows) == len(self._drawn_)
+                    and all(len(row) <= self._cols_ for row in rows)
+                ):
+                    # Nothing moved on screen so only rows that changed since the last frame
+                    # are rewritten, in place. The terminal treats row 0 as row 1 so the
+                    # rows start below the same line the full frame starts at. The cursor
+                    # is put back at the end of the frame afterwards
+                    top = max(self._y_, 1) + 1
+                    changed = "".join(
+                        f"\x1b[{top + i};0H{row}"
+                        for i, (row, drawn) in enumerate(zip(rows, self._drawn_))
+                        if row != drawn
+                    )
+                    if changed:
+                        self.__emit__(f"\x1b[s{changed}\x1b[u")
+                else:
+                    # Got to first line of manager then overwrite. The whole frame is
+                    # collected and written at once
+                    frame = [f"\x1b[{self._y_};0H", "\n"]
+                    frame.extend(f"{t}\n" for t in tasks)
+
+                    if len(self.messages) > 0:
+                        messages = "".join(self.messages)
+                        frame.append("\x1b[1m[stdout]\x1b[22m\n")
+                        frame.append(messages)
+                        y += messages.count("\n") + 1
+                        for line in messages.split("\n"):
+                            y += max((len(line) // self._cols_) - 1, 0)
+
+                    # Track how many lines are printed and if the buffers scrolls then
+                    # move the jump y position up by the difference
+                    if self._y_ + y > self._lines_:
+                        self._y_ = max(self._y_ - ((self._y_ + y) - self._lines_), 0)
+
+                    self.__emit__("".join(frame))
+                self._drawn_ = rows
                 self.__lock__.release()
-                sleep(self._rate_)
+                # Wakes immediately when output is captured or the manager is stopped
+                # instead of finishing the tick
+                if self.__wake__.wait(self._rate_):
+                    self.__wake__.clear()
+                    self.__stop__.wait(_MIN_FRAME_)
         except KeyboardInterrupt as interrupt:
             self.exc = interrupt
         except Exception as error:
@@ -151,42 +235,94 @@ class TaskManager(Thread):
         with self.__lock__:
             self.__tasks__.remove(subtask)
 
-    def __del__(self):
+    @staticmethod
+    def __raw_fd__(out) -> int | None:
+        """File descriptor frames can be written to directly, bypassing the text layer.
+
+        Windows consoles don't decode raw utf-8 writes so the stream is always used there.
+        Redirected output also keeps using the stream so it stays buffered like any other write.
+        """
+        if sys.platform == "win32":
+            return None
+        isatty = getattr(out, "isatty", None)
+        if isatty is None or not isatty():
+            return None
+        try:
+            fd = fileno(out)
+        except (ValueError, OSError):
+            return None
+        # Anything already buffered must be written before frames skip the buffer
+        out.flush()
+        return fd
+
+    def __emit__(self, frame: str):
+        """Write a frame to the real stdout."""
+        if not frame:
+            return
+        if self._fd_ is None:
+            self._out_.write(frame)
+            self._out_.flush()
+            return
+
+        data = frame.encode()
+        while data:
+            data = data[os.write(self._fd_, data):]
+
+    def __restore__(self):
         if self._out_ is not None:
             sys.stdout = self._out_
             self._out_ = None
             sys.stdout.flush()
+            _MANAGER_LOCK_.release()
+
+    def __del__(self):
+        self.__restore__()
 
     def stop(self):
         self.join()
 
     def join(self):
         self.__stop__.set()
-        Thread.join(self)
-
-        # Print final state of tasks
-        move_to(0, self._y_)
-        # Got to first line of manager then overwrite
-        self._out_.write("\n")
-        for task in self.__tasks__:
-            task.update(self._rate_)
-            self._out_.write(f"{task}\n")
-        if len(self.messages) > 0:
-            messages = "".join(self.messages)
-            self._out_.write(
-                f"\x1b[1m[stdout]\x1b[22m\n{messages}\x1b[1m[/stdout]\x1b[22m\n\n"
-            )
-        self._out_.flush()
-
-        if self._out_ is not None:
-            sys.stdout = self._out_
-            self._out_ = None
+        self.__wake__.set()
+        try:
+            Thread.join(self)
+
+            # Print final state of tasks. Got to first line of manager then overwrite
+            frame = [f"\x1b[{self._y_};0H", "\n"]
+            for task in self.__tasks__:
+                task.update(self._rate_)
+                frame.append(f"{task}\n")
+
+            # Include anything printed after the last frame was drawn
+            self.messages.extend(self._capture_.drain())
+            if len(self.messages) > 0:
+                messages = "".join(self.messages)
+                frame.append(
+                    f"\x1b[1m[stdout]\x1b[22m\n{messages}\x1b[1m[/stdout]\x1b[22m\n\n"
+                )
+            self.__emit__("".join(frame))
+        finally:
+            self.__restore__()
 
         if self.exc is not None:
             raise self.exc
 
 
 class Task:
+    __slots__ = (
+        "_lock_",
+        "_plock_",
+        "_count_",
+        "_max_",
+        "_length_",
+        "_tasks_",
+        "_subtasks_",
+        "_total_",
+        "_target_",
+        "_callback_",
+        "_complete_",
+    )
+
     def __init__(
         self,
         *tasks: str | Task,
@@ -288,55 +424,104 @@ class Task:
 
 
 class Spinner(Task):
+    __slots__ = (
+        "_prompt_",
+        "_icons_",
+        "_nframes_",
+        "_index_",
+        "_format_",
+        "_widths_",
+        "_longest_",
+        "_base_",
+        "_fill_",
+        "_target_tmpl_",
+        "_target_line_",
+        "_frames_",
+        "_done_",
+    )
+
     def __init__(
         self,
         *tasks: str | Task,
         prompt: str,
-        icons: str | list[str] = Icons.DOTS,
+        icons: str | Sequence[str] = Icons.DOTS,
         rate: float = 0.2,
         format: Literal["p", "s"] = "p",
         target: int = 0,
     ):
         super().__init__(*tasks, rate=rate, target=target)
         self._prompt_ = prompt
-        self._icons_ = icons
+        self._icons_ = tuple(icons)
+        self._nframes_ = len(self._icons_)
         self._index_ = 0
         self._format_ = format
-        self._length_ = len(prompt) + 1
-        if isinstance(icons, str):
-            self._length_ += 1
-        else:
-            self._length_ += max(map(len, icons))
 
-        if self._target_ > 0:
-            self._length_ += 3 + (len(str(self._target_)) * 2)
+        # Display widths are computed once so each frame can pad with a known amount
+        self._widths_ = tuple(_width_(icon) for icon in icons)
+        self._longest_ = max(self._widths_)
+        self._base_ = _width_(prompt) + 1
+        self._length_ = self._base_ + self._longest_
+
+        # Width of the ` [total/target]` suffix
+        suffix = 4 + (len(str(self._target_)) * 2) if self._target_ > 0 else 0
+        self._length_ += suffix
+
+        # `ljust` counts characters, so each icon's frame is justified to the character count
+        # that fills exactly `_length_` columns
+        skew = len(prompt) + 1 - self._base_
+        self._fill_ = tuple(
+            self._length_ + skew + len(icon) - width
+            for icon, width in zip(icons, self._widths_)
+        )
+
+        # Build the frame templates once so each tick only fills in the icon and count.
+        # Without a target every frame is fixed so they are all rendered up front
+        prompt = prompt.replace("%", "%%")
+        if format == "s":
+            tmpl = f"{prompt} %s"
+            self._target_tmpl_ = "[%d/%d]"
+        else:
+            tmpl = f"%s {prompt}"
+            self._target_tmpl_ = f"%s {prompt} [%d/%d]"
+        # Last rendered target line keyed by the (icon, total) it was rendered for
+        self._target_line_ = (None, "")
+        self._frames_ = tuple(
+            (tmpl % icon).ljust(fill) for icon, fill in zip(self._icons_, self._fill_)
+        )
+
+        # Progress can't change once complete so the completed line is constant. It is
+        # padded to the same width as the running frames so it covers them
+        done = f"\x1b[32m●\x1b[39m {self._prompt_}"
+        if self._target_ != 0:
+            done = f"{done} \x1b[32m[{self._target_}/{self._target_}]\x1b[39m"
+        self._done_ = done + " " * (self._length_ - (self._base_ + 1 + suffix))
 
     def update(self, rate: float):
         if not self.complete:
             self._count_ += rate
             if self._count_ >= self._max_:
-                self._index_ = (self._index_ + 1) % len(self._icons_)
+                self._index_ = (self._index_ + 1) % self._nframes_
                 self._count_ = 0
 
         super().update(rate)
 
     def __lines__(self) -> list[str]:
-        result = ""
-        icon = self._icons_[self._index_]
         if self.complete:
-            result = f"\x1b[32m●\x1b[39m {self._prompt_}"
-            if self._target_ != 0:
-                result = f"{result} \x1b[32m[{self._total_}/{self._target_}]\x1b[39m"
-        elif self._format_ == "p":
-            result = f"{icon} {self._prompt_}"
-            if self._target_ != 0:
-                result = f"{result} [{self._total_}/{self._target_}]"
-        elif self._format_ == "s":
-            result = f"{self._prompt_} {icon}"
-            if self._target_ != 0:
-                result = f"[{self._total_}/{self._target_}]"
+            result = [self._done_]
+        elif self._target_ == 0:
+            result = [self._frames_[self._index_]]
+        else:
+            key = (self._index_, self._total_)
+            if key != self._target_line_[0]:
+                if self._format_ == "s":
+                    line = (self._target_tmpl_ % (self._total_, self._target_)).ljust(self._length_)
+                else:
+                    line = (
+                        self._target_tmpl_ % (self._icons_[self._index_], self._total_, self._target_)
+                    ).ljust(self._fill_[self._index_])
+                self._target_line_ = (key, line)
+            result = [self._target_line_[1]]
 
-        result = [result.ljust(self._length_)]
         with self._lock_:
             for task in self._tasks_:
                 if isinstance(task, str):
@@ -347,6 +532,8 @@ class Spinner(Task):
 
 
 class Progress(Task):
+    __slots__ = ("_prompt_", "_brackets_", "_symbol_", "_width_", "_format_")
+
     FILL = "▏▎▍▌▋▊▉█"
 
     def __init__(
@@ -12,21 +12,21 @@ Supported Platforms:
 
 from __future__ import annotations
 
-import re
 import sys
 from collections.abc import Callable
 from contextlib import contextmanager
 from threading import Thread
 import threading
+from time import perf_counter
 from typing import Generator
 
 from .event import Button, Event, Key, Mouse, Record, eprint
 from .keys import keys
 
 if sys.platform == "win32":
-    from .win import read, read_ready, terminal_reset, terminal_setup
+    from .win import read, read_all, read_ready, terminal_reset, terminal_setup
 elif sys.platform in ["linux", "darwin"]:
-    from .unix import read, read_ready, terminal_reset, terminal_setup
+    from .unix import read, read_all, read_ready, terminal_reset, terminal_setup
 else:
     raise ImportError(f"Unsupported platform: {sys.platform}")
 
@@ -43,7 +43,11 @@ __all__ = [
     "supports_ansi",
 ]
 
-ARROW = re.compile(r"\x1b\[(?:\d;\d)?[ABCD]")
+# Seconds the listener waits for input. Right after an event input is polled without waiting
+# so bursts of keys are handled immediately, otherwise it waits so the stop flag is rechecked
+# without spinning.
+BURST_WINDOW = 0.002
+IDLE_WAIT = 0.01
 
 
 @contextmanager
@@ -58,21 +62,51 @@ def terminal_input():
         terminal_reset(data)
 
 
+def _code_end_(chars: str, start: int) -> int:
+    """Index just past the input code that begins at `start`."""
+    if chars[start] != "\x1b" or start + 1 == len(chars):
+        return start + 1
+
+    follow = chars[start + 1]
+    if follow == "[":
+        # Parameters run until the final byte of the sequence: `@` through `~`
+        end = start + 2
+        while end < len(chars) and not "@" <= chars[end] <= "~":
+            end += 1
+        return min(end + 1, len(chars))
+    if follow == "O" and start + 2 < len(chars):
+        return start + 3
+    if follow == "\x1b":
+        # Alt applied to another sequence
+        return _code_end_(chars, start + 1)
+    return start + 2
+
+
+def _split_codes_(chars: str) -> list[str]:
+    """Split the characters read in one go, like a paste or fast typing, into one code
+    per input event. Mouse sequences read together stay together since they describe
+    one mouse event, for example a click while dragging.
+    """
+    codes = []
+    start = 0
+    while start < len(chars):
+        end = _code_end_(chars, start)
+        code = chars[start:end]
+        if codes and code.startswith("\x1b[<") and codes[-1].startswith("\x1b[<"):
+            codes[-1] += code
+        else:
+            codes.append(code)
+        start = end
+    return codes
+
+
 class InputManager:
     """Manager that handles getting characters from stdin."""
 
     def __init__(self):
         self.data = terminal_setup()
-
-    def _read_buff_(self) -> Generator:
-        """Read characters from the buffer until none are left."""
-        try:
-            yield read(1)
-
-            while read_ready(sys.stdin):
-                yield read(1)
-        finally:
-            pass
+        # Codes read after an interrupt, returned by the next `getch_all`
+        self._pending_: list[str] = []
 
     def getch(self, interupt: bool = True) -> str:
         """Get the next character. Blank if no next character.
@@ -81,7 +115,7 @@ class InputManager:
             interupt: Whether to allow for default keyboard interrupts. Defaults to True
         """
 
-        char = "".join(self._read_buff_())
+        char = read_all()
         try:
             if char == chr(3):
                 raise KeyboardInterrupt("Unhandled Interupt")
@@ -90,6 +124,31 @@ class InputManager:
                 raise error
         return char
 
+    def getch_all(self, interupt: bool = True) -> list[str]:
+        """Get every input code that is available, split into one code per event.
+        Blocks until there is at least one code.
+
+        With interrupts, codes read before a `ctrl+c` are returned first and the interrupt
+        is raised by the next call.
+
+        Args:
+            interupt: Whether to allow for default keyboard interrupts. Defaults to True
+        """
+
+        if self._pending_:
+            codes, self._pending_ = self._pending_, []
+        else:
+            codes = _split_codes_(read_all())
+
+        if interupt and chr(3) in codes:
+            index = codes.index(chr(3))
+            if index == 0:
+                self._pending_ = codes[1:]
+                raise KeyboardInterrupt("Unhandled Interupt")
+            self._pending_ = codes[index:]
+            return codes[:index]
+        return codes
+
     def __del__(self):
         if self.data is not None:
             terminal_reset(self.data)
@@ -120,21 +179,21 @@ class InputManager:
         with InputManager() as input:
             while True:
                 try:
-                    char = input.getch(interupt)
-                    if char != "":
-                        arrows = list(ARROW.finditer(char))
-                        if len(arrows) > 1:
-                            start = arrows[0].start()
-                            start = char[:start]
-                            for arrow in arrows:
-                                yield Record(start + arrow.group(0))
-                        else:
-                            yield Record(char)
-                except KeyboardInterrupt as error:
-                    raise error
+                    codes = input.getch_all(False)
                 except Exception:
                     continue
 
+                # Codes are handled in order so input before an interrupt is still yielded and
+                # a code that fails to parse only skips itself
+                for code in codes:
+                    if interupt and code == chr(3):
+                        raise KeyboardInterrupt("Unhandled Interupt")
+                    try:
+                        record = Record(code)
+                    except Exception:
+                        continue
+                    yield record
+
 def _void_(*_):
     pass
 
@@ -179,15 +238,12 @@ class Listener(Thread):
         if result is False:
             return False
 
-        if record == "KEY":
+        # Read the type directly instead of going through Record.__eq__
+        if record.type == "KEY":
             result = self._on_key_(record.key, self._state_)
-            if result is False:
-                return False
-        elif record == "MOUSE":
+        else:
             result = self._on_mouse_(record.mouse, self._state_)
-            if result is False:
-                return False
-        return True
+        return result is not False
 
     def run(self):
         if not self._surpress_ and not self._interupt_:
@@ -197,18 +253,26 @@ class Listener(Thread):
             )
 
         with InputManager() as console:
+            last = 0.0
             while not self._stop_.is_set():
                 try:
-                    char = console.getch(self._interupt_)
-                    if char != "":
-                        arrows = list(ARROW.finditer(char))
-                        if len(arrows) > 1:
-                            start = arrows[0].start()
-                            start = char[:start]
-                            for arrow in arrows:
-                                self._handle_(Record(start + arrow.group(0)))
-                        else:
-                            self._handle_(Record(char))
+                    wait = 0.0 if perf_counter() - last < BURST_WINDOW else IDLE_WAIT
+                    if not read_ready(sys.stdin, wait):
+                        continue
+
+                    codes = console.getch_all(False)
+                    last = perf_counter()
+                    # A burst of input is handled in one pass before reading again. Codes are
+                    # handled in order so input before an interrupt is still handled, and a
+                    # code that fails only skips itself
+                    for code in codes:
+                        if self._interupt_ and code == chr(3):
+                            raise KeyboardInterrupt("Unhandled Interupt")
+                        try:
+                            if not self._handle_(Record(code)):
+                                return
+                        except Exception:
+                            continue
                 except KeyboardInterrupt as error:
                     self._on_interrupt_()
                     self.exc = error
@@ -235,13 +299,7 @@ def supports_ansi() -> bool:
     sys.stdout.flush()
 
     # Collect input which could be blank meaning no ansi input
-    char = ""
-    try:
-        char += read(1)
-        while read_ready(sys.stdin):
-            char += read(1)
-    finally:
-        pass
+    char = read_all()
 
     return char != "" and char.startswith("\x1b[") and char.endswith("R")
 
@@ -1,36 +1,92 @@
-from sys import stdin, stdout
-from typing import Literal
-from . import read, read_ready
+import re
+from contextlib import contextmanager
+from sys import stdout
+from threading import local
+from typing import Generator, Literal
+from . import read_all
+
+_batch_ = local()
+
+_POSITION_ = re.compile(r"\x1b\[(\d+);(\d+)R", re.ASCII)
+"""Cursor position reply, `\\x1b[{y};{x}R`."""
+
+# Counted moves are almost always small so those sequences are only formatted once
+_SMALL_ = range(9)
+_UP_ = tuple(f"\x1b[{i}A" for i in _SMALL_)
+_DOWN_ = tuple(f"\x1b[{i}B" for i in _SMALL_)
+_LEFT_ = tuple(f"\x1b[{i}C" for i in _SMALL_)
+_RIGHT_ = tuple(f"\x1b[{i}D" for i in _SMALL_)
+_DEL_LINE_ = tuple(f"\x1b[{i}M" for i in _SMALL_)
+_INSERT_LINE_ = tuple(f"\x1b[{i}L" for i in _SMALL_)
+
+def _emit_(sequence: str):
+    """Write and flush the sequence, or add it to the current thread's batch."""
+    buffer = getattr(_batch_, "buffer", None)
+    if buffer is not None:
+        buffer.append(sequence)
+    else:
+        stdout.write(sequence)
+        stdout.flush()
+
+def _take_batch_() -> str:
+    """Remove and return everything batched so far on the current thread."""
+    buffer = getattr(_batch_, "buffer", None)
+    if not buffer:
+        return ""
+    pending = "".join(buffer)
+    buffer.clear()
+    return pending
+
+@contextmanager
+def batched() -> Generator[None, None, None]:
+    """Collect every action in the block and write them with a single write and flush.
+
+    Nested blocks are merged into the outermost one.
+
+    Example:
+        with batched():
+            save_cursor()
+            move_to(0, 10)
+            del_line()
+            load_cursor()
+    """
+    if getattr(_batch_, "buffer", None) is not None:
+        yield
+        return
+
+    _batch_.buffer = []
+    try:
+        yield
+    finally:
+        pending = _take_batch_()
+        _batch_.buffer = None
+        if pending:
+            stdout.write(pending)
+            stdout.flush()
 
 def up(count: int = 1):
     """Move the cursor up by {count} lines."""
-    stdout.write(f"\x1b[{count}A")
-    stdout.flush()
+    _emit_(_UP_[count] if count in _SMALL_ else f"\x1b[{count}A")
 
 def down(count: int = 1):
     """Move the cursor down by {count} lines."""
-    stdout.write(f"\x1b[{count}B")
-    stdout.flush()
+    _emit_(_DOWN_[count] if count in _SMALL_ else f"\x1b[{count}B")
 
 def left(count: int = 1):
     """Move the cursor left by {count} columns."""
-    stdout.write(f"\x1b[{count}C")
-    stdout.flush()
+    _emit_(_LEFT_[count] if count in _SMALL_ else f"\x1b[{count}C")
 
 def right(count: int = 1):
     """Move the cursor right by {count} columns."""
-    stdout.write(f"\x1b[{count}D")
-    stdout.flush()
+    _emit_(_RIGHT_[count] if count in _SMALL_ else f"\x1b[{count}D")
 
 def to_x(_x: int = 0):
     """Move cursor to x position, absolute."""
-    stdout.write(f"\x1b[{_x}G")
-    stdout.flush()
+    _emit_(f"\x1b[{_x}G")
 
 def to_y(_y: int = 0):
     """Move cursor to y position, absolute."""
-    stdout.write(f"\x1b[{_y}d")
-    stdout.flush()
+    _emit_(f"\x1b[{_y}d")
 
 def move_to(_x: int = 0, _y: int = 0):
     """Move cursor to x,y position, absolute.
@@ -38,35 +94,29 @@ def move_to(_x: int = 0, _y: int = 0):
     Call with no args or with 0, 0 to execute the `home` command; `\\x1b[H`
     """
     if _x == 0 and _y == 0:
-        stdout.write("\x1b[H")
+        _emit_("\x1b[H")
     else:
-        stdout.write(f"\x1b[{_y};{_x}H")
-    stdout.flush()
+        _emit_(f"\x1b[{_y};{_x}H")
 
 def save_cursor():
     """Save the cursors current position."""
-    stdout.write(f"\x1b[s")
-    stdout.flush()
+    _emit_("\x1b[s")
 
 def load_cursor():
     """Load the cursors previous position."""
-    stdout.write(f"\x1b[u")
-    stdout.flush()
+    _emit_("\x1b[u")
 
 def delete(count: int = 1):
     """Delete {count} characters."""
-    stdout.write(f"\x1b[{count}P")
-    stdout.flush()
+    _emit_(f"\x1b[{count}P")
 
 def erase(count: int = 1):
     """Erase {count} characters. Replaces them with ` `"""
-    stdout.write(f"\x1b[{count}X")
-    stdout.flush()
+    _emit_(f"\x1b[{count}X")
 
 def del_line(count: int = 1):
     """Delete {count} lines starting from the cursors current position."""
-    stdout.write(f"\x1b[{count}M")
-    stdout.flush()
+    _emit_(_DEL_LINE_[count] if count in _SMALL_ else f"\x1b[{count}M")
 
 def erase_display(mode: Literal[0, 1, 2] = 2):
     """Erase in the erase_display
@@ -76,8 +126,7 @@ def erase_display(mode: Literal[0, 1, 2] = 2):
         1: Erase from cursor to end of display
         2: Erase entire display
     """
-    stdout.write(f"\x1b[{mode}J")
-    stdout.flush()
+    _emit_(f"\x1b[{mode}J")
 
 def cursor(mode: Literal[0, 1, 2, 3, 4, 5, 6] | None = None, show: bool | None = None):
     """Set the cursor shape
@@ -95,23 +144,22 @@ def cursor(mode: Literal[0, 1, 2, 3, 4, 5, 6] | None = None, show: bool | None =
         5: Blinking Bar
         6: Steady Bar
     """
+    sequence = ""
     if mode is not None:
-        stdout.write(f"\x1b[{mode}q")
+        sequence += f"\x1b[{mode}q"
     if show is not None:
-        stdout.write(f"\x1b[25{'h' if show else 'l'}")
-    stdout.flush()
+        sequence += f"\x1b[25{'h' if show else 'l'}"
+    _emit_(sequence)
 
 def insert_line(count: int = 1):
     """Insert a line where the cursor is pushing all other lines down.
     This includes the line the cursor is current on.
     """
-    stdout.write(f"\x1b[{count}L")
-    stdout.flush()
+    _emit_(_INSERT_LINE_[count] if count in _SMALL_ else f"\x1b[{count}L")
 
 def set_title(title: str = ""):
     """Set the terminal title."""
-    stdout.write(f"\x1b]0;{title}\x07")
-    stdout.flush()
+    _emit_(f"\x1b]0;{title}\x07")
 
 def pos() -> tuple[int, int]:
     """Get the cursors current position. (x, y)
@@ -119,17 +167,13 @@ def pos() -> tuple[int, int]:
     Returns:
         (int, int): The x and y coordinates of the cursor.
     """
-    stdout.write("\x1b[6n")
+    # The query has to reach the terminal now so anything batched is sent with it
+    stdout.write(_take_batch_() + "\x1b[6n")
     stdout.flush()
 
-    # Collect input which could be blank meaning no ansi input
-    char = ""
-    try:
-        char += read(1)
-        while read_ready(stdin):
-            char += read(1)
-    finally: pass
-
-    char = char.lstrip("\x1b[").rstrip("R")
-    y, x = char.split(";")
-    return int(x), int(y)
+    # Other input, like a held key, can be read before or along with the reply so the
+    # reply itself is searched for
+    char = read_all()
+    while (reply := _POSITION_.search(char)) is None:
+        char += read_all()
+    return int(reply.group(2)), int(reply.group(1))
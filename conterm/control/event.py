@@ -5,18 +5,18 @@ The logic in this module helps to indetify and compare events.
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
 from enum import Enum
-from functools import cache
+from functools import lru_cache
 from typing import Literal, Protocol, runtime_checkable
 
 from .keys import keys
 
 
-@cache
+@lru_cache(maxsize=1024)
 def _build_chord_(modifiers: int, key: str) -> str:
     """Builds string chord from key event data. Caches results
-    for prolonged keyboard event captures.
+    for prolonged keyboard event captures. The cache is bounded since unknown
+    sequences can produce any number of keys.
     """
     ctrl = "ctrl+" if modifiers & Modifiers.Ctrl else ""
     alt = "alt+" if modifiers & Modifiers.Alt else ""
@@ -27,7 +27,8 @@ def _build_chord_(modifiers: int, key: str) -> str:
 
 
 __ANSI__ = re.compile(
-    r"(?P<sequence>\x1b\[(?P<data>(?:\d{1,3};?)*)(?P<event>[ACBDmMZFHPQRS~]{1,2})?)t?|(\x1b(?!O))|(?P<key>.{1,3}|[\n\r\t])"
+    r"(?P<sequence>\x1b\[(?P<data>(?:\d{1,3};?)*)(?P<event>[ACBDmMZFHPQRS~]{1,2})?)t?|(\x1b(?!O))|(?P<key>.{1,3}|[\n\r\t])",
+    re.ASCII,
 )
 """Regex for key event sequences.
 
@@ -38,7 +39,47 @@ Produces (in order):
     - key
 """
 
-__MOUSE__ = re.compile(r"\[<(.+)([ACBDFHMZmM~])")
+_CSI_DATA_ = frozenset("0123456789;")
+_CSI_EVENTS_ = frozenset("ACBDmMZFHPQRS~")
+
+
+def _decode_(code: str) -> tuple[int, str, str] | None:
+    """Decode a key code into the number of ansi matches and the sequence and key of the
+    last match. None when nothing matches.
+
+    Plain csi sequences, `\x1b[1;5A`, and alt with a single character, `\x1bd`, make up
+    almost all multi character input so they are walked by hand. Everything else falls
+    back to the ansi regex.
+    """
+    size = len(code)
+    if size > 2 and code[0] == "\x1b" and code[1] == "[":
+        # Data is digits where each `;` must follow a digit, then a single event character
+        digit = False
+        index = 2
+        while index < size - 1 and (char := code[index]) in _CSI_DATA_:
+            if char == ";":
+                if not digit:
+                    break
+                digit = False
+            else:
+                digit = True
+            index += 1
+        if index == size - 1 and code[index] in _CSI_EVENTS_:
+            return 1, code, ""
+    elif size == 2 and code[0] == "\x1b" and code[1] not in "O[":
+        return 2, "", code[1]
+
+    last = None
+    count = 0
+    for last in __ANSI__.finditer(code):
+        count += 1
+    if last is None:
+        return None
+    # The unnamed group is a lone escape
+    return count, last.group("sequence") or "", last.group("key") or last.group(4) or ""
+
+
+__MOUSE__ = re.compile(r"\x1b\[<(\d+(?:;\d+)*)([ACBDFHMZm~])", re.ASCII)
 """Regex for mouse event sequences.
 
 Produces (in order):
@@ -47,15 +88,41 @@ Produces (in order):
 """
 
 
-@dataclass
+def _split_name_(name: str) -> tuple[int, str]:
+    """Split a key name, `CTRL_ALT_D`, into its modifier flags and lowercase key."""
+    mods = name.split("_")
+    modifiers = 0
+    if "CTRL" in mods:
+        modifiers |= Modifiers.Ctrl
+    if "ALT" in mods:
+        modifiers |= Modifiers.Alt
+    if "SHIFT" in mods:
+        modifiers |= Modifiers.Shift
+    return modifiers, mods[-1].lower()
+
+
+@lru_cache(maxsize=512)
+def _chord_code_(chord: str) -> str | None:
+    """Key code for a chord. Handlers compare against the same few chords on every event
+    so lookups are cached.
+    """
+    return keys.by_chord(chord)
+
+
 class Modifiers:
     """Custom modifier flags for key events."""
 
+    __slots__ = ()
+
     Ctrl = 0x0001
     Alt = 0x0002
     Shift = 0x0004
 
 
+_KEY_META_ = {name: _split_name_(name) for name in keys.keys()}
+"""Modifier flags and lowercase key for every key name, split once at import."""
+
+
 class Event(Enum):
     """Mouse event types."""
 
@@ -79,6 +146,10 @@ class Event(Enum):
     """Scroll wheel down."""
 
 
+_BUTTON_EVENTS_ = {"M": Event.CLICK, "m": Event.RELEASE}
+"""Button event for the final character of a button sequence."""
+
+
 class Button(Enum):
     """Mouse buttons."""
 
@@ -98,6 +169,20 @@ class Button(Enum):
             return self in [MouseButtonShort[v.upper()] for v in __value.split(":")]
         return False
 
+# Value to member map of the buttons. Reading it directly skips the `Enum.__call__`
+# dispatch when mouse events are parsed
+_BUTTON_BY_VALUE_ = Button._value2member_map_
+
+_MOUSE_EVENTS_ = {
+    Event.SCROLL_UP.value: ((Event.SCROLL_UP,), False),
+    Event.SCROLL_DOWN.value: ((Event.SCROLL_DOWN,), False),
+    Event.MOVE.value: ((Event.MOVE,), True),
+    Event.DRAG_LEFT_CLICK.value: ((Event.DRAG, Event.DRAG_LEFT_CLICK), True),
+    Event.DRAG_MIDDLE_CLICK.value: ((Event.DRAG, Event.DRAG_MIDDLE_CLICK), True),
+    Event.DRAG_RIGHT_CLICK.value: ((Event.DRAG, Event.DRAG_RIGHT_CLICK), True),
+}
+"""Events added for each non button mouse code and whether the code carries a position."""
+
 class MouseEventShort(Enum):
     M = Event.MOVE
     D = Event.DRAG
@@ -132,39 +217,27 @@ class Mouse:
         self.code = code
         self.pos = (-1, -1)
 
-        events = filter(lambda x: x != "", code.split("\x1b"))
         # Iterate through the different mouse sequences
-        for event in events:
-            if (match := __MOUSE__.match(event)) is not None:
-                # Parse the data and button event from the sequence
-                data, event = match.groups()
-
-                # Split data into tuple. First value is the type of mouse event
-                # then the other values are information for that event.
-                data = data.split(";")
-                if (button := int(data[0])) in [0, 1, 2]:
-                    if event == "M":
-                        self.events[Event.CLICK.name] = Event.CLICK
-                    elif event == "m":
-                        self.events[Event.RELEASE.name] = Event.RELEASE
-                    self.button = Button(button)
-                elif (scroll := int(data[0])) in [65, 64]:
-                    event = Event(scroll)
+        for match in __MOUSE__.finditer(code):
+            # Parse the data and button event from the sequence
+            data, event = match.groups()
+
+            # Split data into integers once. First value is the type of mouse event
+            # then the other values are information for that event.
+            data = [int(value) for value in data.split(";")]
+            code0 = data[0]
+            if code0 in (0, 1, 2):
+                if (button_event := _BUTTON_EVENTS_.get(event)) is not None:
+                    self.events[button_event.name] = button_event
+                self.button = _BUTTON_BY_VALUE_[code0]
+            elif (entry := _MOUSE_EVENTS_.get(code0)) is not None:
+                events, moves = entry
+                for event in events:
                     self.events[event.name] = event
-                elif (move := int(data[0])) == 35:
-                    event = Event(move)
-                    self.events[event.name] = event
-                    if len(data[1:]) < 2:
-                        raise ValueError(f"Invalid mouse move sequence: {code}")
-                    self.pos = (int(data[1]), int(data[2]))
-                elif (drag := int(data[0])) in [32, 33, 34]:
-                    event = Event(drag)
-                    self.events.update({Event.DRAG.name: Event.DRAG, event.name: event})
-                    if len(data[1:]) < 2:
+                if moves:
+                    if len(data) < 3:
                         raise ValueError(f"Invalid mouse move sequence: {code}")
-                    try:
-                        self.pos = (int(data[1]), int(data[2]))
-                    except Exception: pass
+                    self.pos = (data[1], data[2])
 
     def event_of(self, *events: Event) -> bool:
         """Check if the mouse event is one of the given mouse events."""
@@ -196,17 +269,13 @@ class Mouse:
         return False
 
     def __event_to_str__(self, event: Event) -> str:
-        symbol = event.name
-        # __contains__ treats a list of events as running any
-        if self.event_of(Event.CLICK, Event.RELEASE):
-            symbol = self.button.name
-
-        if Event.CLICK.name in self.events:
-            symbol = f"\x1b[32m{symbol}\x1b[39m"
-        elif Event.RELEASE.name in self.events:
-            symbol = f"\x1b[31m{symbol}\x1b[39m"
-
-        return symbol
+        if "CLICK" in self.events:
+            color = 32
+        elif "RELEASE" in self.events:
+            color = 31
+        else:
+            return event.name
+        return f"\x1b[{color}m{self.button.name}\x1b[39m"
 
     def __eprint__(self) -> str:
         events = (
@@ -231,38 +300,31 @@ class Key:
         self.key = ""
         self.code = code
 
-        parts = __ANSI__.findall(code)
-        if len(parts) == 2:
+        # Most input is a single plain character so it skips the sequence parsing
+        if len(code) == 1 and code != "\x1b":
+            if (name := keys.by_code(code)) is not None:
+                self.modifiers, self.key = _KEY_META_[name]
+            else:
+                self.key = code
+            return
+
+        if (decoded := _decode_(code)) is None:
+            self.key = f"{code!r}"
+            return
+
+        count, sequence, key = decoded
+        # A leading escape before the key is the alt modifier
+        if count == 2:
             self.modifiers |= Modifiers.Alt
 
-        # sequence, data, event, key
-        sequence, data, _, esc, key = parts[-1]
-        key = key or esc
         if key != "" or sequence != "":
-            k = (k := keys.by_code(key)) or (k := keys.by_code(sequence))
-            if k is not None:
-                mods = k.split("_")
-                if "CTRL" in mods:
-                    self.modifiers |= Modifiers.Ctrl
-                if "ALT" in mods:
-                    self.modifiers |= Modifiers.Alt
-                if "SHIFT" in mods:
-                    self.modifiers |= Modifiers.Shift
-                self.key = mods[-1].lower()
+            if (name := keys.by_code(key) or keys.by_code(sequence)) is not None:
+                modifiers, self.key = _KEY_META_[name]
+                self.modifiers |= modifiers
             else:
                 self.key = key or sequence
-        elif sequence != "" and data != "" and (key := keys.by_code(sequence)):
-            mods = key.split("_")
-            if "CTRL" in mods:
-                self.modifiers |= Modifiers.Ctrl
-            if "ALT" in mods:
-                self.modifiers |= Modifiers.Alt
-            if "SHIFT" in mods:
-                self.modifiers |= Modifiers.Shift
-            self.key = mods[-1].lower()
         else:
             self.key = f"{code!r}"
-        # mod, ckey, esc, data, event
 
     def is_ascii(self) -> bool:
         return len(self.key) == 1 and self.key.isascii()
@@ -281,7 +343,7 @@ class Key:
 
     def __eq__(self, __value: object) -> bool:
         if isinstance(__value, str):
-            return keys.by_chord(__value) == self.code
+            return _chord_code_(__value) == self.code
         if isinstance(__value, Key):
             return __value.code == self.code
         return False
@@ -296,6 +358,14 @@ class Key:
         return f"KeyEvent({self.code!r}, key={self.key}, {self.modifiers})"
 
 
+@lru_cache(maxsize=256)
+def _key_(code: str) -> Key:
+    """Parsed key for the code. Keys aren't changed after they are parsed so repeated
+    input, like held or commonly used keys, shares one instance.
+    """
+    return Key(code)
+
+
 class Record:
     """Input event based on an ansi code.
 
@@ -307,15 +377,18 @@ class Record:
     __slots__ = ("type", "key", "mouse")
 
     def __init__(self, code: str) -> None:
-        self.type: Literal["KEY", "MOUSE"] = "KEY"
-        self.key = None
-        self.mouse = None
-
-        if code.startswith("\x1b[<"):
+        self.type: Literal["KEY", "MOUSE"]
+        # Only mouse sequences start with `\x1b[<`. The third character decides the kind so
+        # every slot is only assigned once. Plain key codes are rejected by the length or
+        # the first character compare
+        if len(code) > 2 and code[2] == "<" and code[0] == "\x1b" and code[1] == "[":
             self.type = "MOUSE"
+            self.key = None
             self.mouse = Mouse(code)
         else:
-            self.key = Key(code)
+            self.type = "KEY"
+            self.key = _key_(code)
+            self.mouse = None
 
     def __eq__(self, other) -> bool:
         if isinstance(other, Record):
@@ -4,8 +4,8 @@ from typing import ItemsView, KeysView, ValuesView
 
 if sys.platform == "win32":
     from .win import KEYS
-elif sys.platform == "linux":
-    from .linux import KEYS
+elif sys.platform in ["linux", "darwin"]:
+    from .unix import KEYS
 else:
     raise ImportError(f"Unsupported platform: {sys.platform}")
 
@@ -145,18 +145,21 @@ class KeyCode:
             **KEYS,
         }
 
+        # Reverse lookup for key codes. Several names share a code, `ESC` and `ALT` for
+        # example, so the first name defined for a code is kept
+        self._codes_: dict[str, str] = {}
+        for name, code in self._keys.items():
+            self._codes_.setdefault(code, name)
+
     def __getattr__(self, key) -> str:
         return self._keys.get(key, "")
 
     def __contains__(self, key: str) -> bool:
-        return key in self.values()
+        return key in self._codes_
 
     def by_code(self, code: str, default: str | None = None) -> str | None:
         """Get the key name from the key code."""
-        for name, value in self._keys.items():
-            if code == value:
-                return name
-        return default
+        return self._codes_.get(code, default)
 
     def by_chord(self, chord: str, default: str | None = None) -> str | None:
         """Get the key code given the key chord.
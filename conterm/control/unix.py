@@ -27,18 +27,19 @@ KEYS = {
     # "F12": "\x1b[24~",
 }
 
-def read_ready(file: IO[AnyStr]) -> bool:
+def read_ready(file: IO[AnyStr], timeout: float = 0.0) -> bool:
     """Determines if IO object is reading to read.
 
     Args:
         file: An IO object of any type.
+        timeout: How many seconds to wait for content. Defaults to not waiting.
 
     Returns:
         A boolean describing whether the object has unread
         content.
     """
 
-    result = select([file], [], [], 0.0)
+    result = select([file], [], [], timeout)
     return len(result[0]) > 0
 
 
@@ -63,6 +64,27 @@ def read(num: int) -> str:
 
     return buff
 
+def read_all(size: int = 64) -> str:
+    """Reads everything that is currently available from sys.stdin. Blocks until there
+    is at least one character.
+
+    Args:
+        size: How many bytes to request from stdin per read.
+
+    Returns:
+        The characters read.
+    """
+
+    descriptor = sys.stdin.fileno()
+    data = os.read(descriptor, size)
+    while read_ready(sys.stdin):
+        data += os.read(descriptor, size)
+
+    try:
+        return decode(data)
+    except UnicodeDecodeError:
+        return str(data)
+
 def terminal_setup() -> tuple[int, list]:
     """Enable terminal cbreak mode.
 
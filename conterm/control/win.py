@@ -3,6 +3,7 @@ import msvcrt
 from typing import IO, Any, AnyStr, cast
 from enum import Enum
 import sys
+from time import perf_counter, sleep
 
 from ctypes import WinError, byref, LibraryLoader, WinDLL
 from ctypes.wintypes import BOOL, DWORD, HANDLE, LPDWORD
@@ -102,17 +103,27 @@ KEYS = {
     "CTRL_ENTER": "\n",
 }
 
-def read_ready(_: IO[AnyStr]) -> bool:
+def read_ready(_: IO[AnyStr], timeout: float = 0.0) -> bool:
     """Determines if IO object is reading to read.
 
     Args:
         file: An IO object of any type.
+        timeout: How many seconds to wait for content. Defaults to not waiting.
 
     Returns:
         A boolean describing whether the object has unread
         content.
     """
-    return msvcrt.kbhit()
+    if msvcrt.kbhit():
+        return True
+
+    # The console can't be waited on like a unix file so poll it until the timeout
+    end = perf_counter() + timeout
+    while perf_counter() < end:
+        sleep(0.001)
+        if msvcrt.kbhit():
+            return True
+    return False
 
 def _ensure_str(string: AnyStr) -> str:
     """Ensures return value is always a `str` and not `bytes`.
@@ -144,6 +155,22 @@ def read(_: int) -> str:
 
     return _ensure_str(msvcrt.getch()) # type: ignore
 
+def read_all(_: int = 64) -> str:
+    """Reads everything that is currently available from sys.stdin. Blocks until there
+    is at least one character.
+
+    Args:
+        size: Unused. Windows reads the console one character at a time.
+
+    Returns:
+        The characters read.
+    """
+
+    chars = [_ensure_str(msvcrt.getch())]  # type: ignore
+    while msvcrt.kbhit():  # type: ignore
+        chars.append(_ensure_str(msvcrt.getch()))  # type: ignore
+    return "".join(chars)
+
 def terminal_setup() -> tuple[DWORD, DWORD]:
     """Enable virtual sequence processing for the windows terminal.
 
@@ -3,7 +3,6 @@
 This module doesn't prove to replace other logging libraries.
 It means to only provide a simple logging interface that can be used with this conterm.
 """
-from dataclasses import dataclass
 from datetime import datetime
 from io import TextIOWrapper
 from sys import stderr
@@ -25,7 +24,6 @@ _CODES_ = {
     2: ("ERROR", "red")
 }
 
-@dataclass
 class LogLevel:
     """Default log levels.
 
@@ -34,6 +32,8 @@ class LogLevel:
     Error: 2
     """
 
+    __slots__ = ()
+
     Info = 0
     Warn = 1
     Error = 2
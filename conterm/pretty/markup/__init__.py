@@ -11,8 +11,8 @@ from functools import wraps
 from typing import TYPE_CHECKING
 
 from .color import Color
-from .macro import RESET, Align, CustomMacros, Macro
-from .util import Hyperlink, strip_ansi
+from .macro import EMPTY_MACRO, RESET, Align, CustomMacros, Macro, parse_macro
+from .util import Hyperlink, mark_non_printing, strip_ansi
 
 def sort_customs(custom: tuple[str, Callable]):
     if not hasattr(custom[1], "__custom_modify__"):
@@ -23,24 +23,61 @@ if TYPE_CHECKING:
     from _typeshed import SupportsWrite
 
 MACRO = re.compile(r"(?<!\\)\[[^\]]+(?<!\\)\]")
+ESCAPE = re.compile(r"(?<!\\)\\(?!\\)")
+"""Single backslashes that escape the next character in text tokens."""
+
+def unescape(text: str) -> str:
+    """Remove escaping backslashes from a text token. Most text has no backslashes so it
+    is returned as is."""
+    if "\\" not in text:
+        return text
+    return ESCAPE.sub("", text).replace("\\\\", "\\")
 
 __all__ = ["Markup", "Macro", "Color", "Hyperlink"]
 
 class Markup:
+    __slots__ = (
+        "markup",
+        "_result_",
+        "_customs_",
+        "_customs_cache_",
+        "_custom_sort_key_",
+        "_stash_",
+        "_stash_stack_",
+    )
+
     def __init__(self, customs: list[Callable|tuple[str,Callable]] | None = None) -> None:
         self.markup = ""
         self._result_ = ""
-        self._customs_: CustomMacros = {}
-        for custom in customs or []:
-            if isinstance(custom, tuple):
-                self._customs_[custom[0]] = custom[1]
-            else:
-                self._customs_[custom.__name__] = custom
 
-        self._stash_ = {}
-        self._stash_stack_ = []
+        # Most markup is parsed without customs or stashing so their containers are only
+        # created when they are used
+        self._customs_: CustomMacros | None = None
+        self._custom_sort_key_: dict[str, int] | None = None
+        self._customs_cache_: dict[tuple[str, ...], list[tuple[str, Callable]]] | None = None
+        if customs:
+            self._customs_ = {}
+            for custom in customs:
+                if isinstance(custom, tuple):
+                    self._customs_[custom[0]] = custom[1]
+                else:
+                    self._customs_[custom.__name__] = custom
+            # Sort order of each custom is computed once instead of on every sort
+            self._custom_sort_key_ = {
+                name: sort_customs((name, custom)) for name, custom in self._customs_.items()
+            }
+            # Sorted customs for each list of custom macro names. Customs don't change after
+            # construction so entries never go stale
+            self._customs_cache_ = {}
+
+        self._stash_: dict[str, Macro] | None = None
+        self._stash_stack_: list[str] | None = None
 
     def stash(self, macro: Macro, name: str = ""):
+        if self._stash_ is None:
+            self._stash_ = {}
+            self._stash_stack_ = []
+
         if name == "":
             name = f"{macro.macro}-{len(self._stash_stack_)}"
         self._stash_[name] = macro
@@ -52,11 +89,14 @@ class Markup:
         Returns:
             None when there are no macro's to pop
         """
+        if self._stash_ is None:
+            self._stash_ = {}
+            self._stash_stack_ = []
+
         if key is None:
             return self._stash_.pop(self._stash_stack_.pop())
 
-        index = self._stash_stack_.index(key)
-        self._stash_stack_.pop(index)
+        self._stash_stack_.remove(key)
         return self._stash_.pop(key)
 
     def feed(self, markup: str, *, sep: str = "", mar: bool = True):
@@ -69,8 +109,8 @@ class Markup:
         """Clear all markup currently in the parser."""
         self.markup = ""
         self._result_ = ""
-        self._stash_.clear()
-        self._stash_stack_.clear()
+        self._stash_ = None
+        self._stash_stack_ = None
 
     def __str__(self) -> str:
         return self._result_
@@ -86,24 +126,18 @@ class Markup:
 
         for macro in MACRO.finditer(markup):
             if macro.start() > last:
-                tokens.append(
-                    re.sub(
-                        r"(?<!\\)\\(?!\\)", "", markup[last : macro.start()]
-                    ).replace("\\\\", "\\")
-                )
+                tokens.append(unescape(markup[last : macro.start()]))
             last = macro.start() + len(macro.group(0))
-            tokens.append(Macro(macro.group(0)))
+            tokens.append(parse_macro(macro.group(0)))
         if last < len(markup):
-            tokens.append(
-                re.sub(r"(?<!\\)\\(?!\\)", "", markup[last:]).replace("\\\\", "\\")
-            )
+            tokens.append(unescape(markup[last:]))
 
         return tokens
 
     def __stash_pop__(self, cmacro: Macro, token: Macro) -> Macro:
         if token.stash:
             self.stash(cmacro)
-            cmacro = Macro()
+            cmacro = EMPTY_MACRO
         if token.pop:
             if (
                 isinstance(token.pop, str)
@@ -116,7 +150,14 @@ class Markup:
         return cmacro
 
     def collect_customs(self, customs: list[str]):
-        return sorted(
+        if self._customs_ is None:
+            return ()
+
+        key = tuple(customs)
+        if (cached := self._customs_cache_.get(key)) is not None:
+            return cached
+
+        self._customs_cache_[key] = result = sorted(
             map(
                 lambda c: (c, self._customs_[c]),
                 filter(
@@ -124,12 +165,17 @@ class Markup:
                     customs
                 ), 
             ),
-            key=sort_customs
+            key=lambda c: self._custom_sort_key_[c[0]]
         )
+        return result
 
     def __parse__(self, tokens: list[Macro | str], *, close: bool = True, mar: bool) -> str:
-        output = ""
-        cmacro = Macro()
+        # Output is collected in parts and joined once. Alignment is tracked by the index of
+        # the part it starts at and replaces every part after it when applied
+        parts = []
+        # The current macro is only ever replaced, never modified, until it has an
+        # alignment. The shared empty macro never does
+        cmacro = EMPTY_MACRO
         previous = "text"
         url_open = None
         align = None
@@ -145,7 +191,7 @@ class Markup:
                 previous = "text"
                 if isinstance(cmacro.url, str):
                     url_open = cmacro.url
-                elif cmacro.url == RESET:
+                elif cmacro.url is RESET:
                     url_open = None
 
                 repl = 1
@@ -159,25 +205,26 @@ class Markup:
                         repl += 1
 
                 if cmacro.align is not None:
-                    if cmacro.align == RESET and align is not None:
-                        output = output[:align[1]] + align[0].apply(output[align[1]:], cmacro, cmacro.url)
+                    if cmacro.align is RESET and align is not None:
+                        parts[align[1]:] = [align[0].apply("".join(parts[align[1]:]), cmacro, cmacro.url)]
                         align = None
                     elif isinstance(cmacro.align, Align):
                         if align is not None:
-                            output = output[:align[1]] + align[0].apply(output[align[1]:], cmacro, cmacro.url)
-                        align = (cmacro.align, len(output))
+                            parts[align[1]:] = [align[0].apply("".join(parts[align[1]:]), cmacro, cmacro.url)]
+                        align = (cmacro.align, len(parts))
                     cmacro.align = None
                 
-                output += f"{cmacro}{token}"
+                parts.append(f"{cmacro}{token}")
 
         if align is not None:
-            output = output[:align[1]] + align[0].apply(output[align[1]:], url=url_open)
+            parts[align[1]:] = [align[0].apply("".join(parts[align[1]:]), url=url_open)]
 
         if close:
-            reset = '\x1b[0m' if mar else ''
-            cl = Hyperlink.close if url_open is not None else ''
-            output += f"{reset}{cl}"
-        return output
+            if mar:
+                parts.append("\x1b[0m")
+            if url_open is not None:
+                parts.append(Hyperlink.close)
+        return "".join(parts)
 
     @staticmethod
     def modify(func: Callable[[str], str]):
@@ -235,12 +282,19 @@ class Markup:
         sep: str = " ",
         end: str = "\n",
         file: "SupportsWrite[str] | None" = None,
+        for_prompt: bool = False,
     ):
         """Print in string markup to stdout with a space gap."""
-        print(Markup.parse(*markup, customs=customs, sep=sep), end=end, file=file)
+        print(Markup.parse(*markup, customs=customs, sep=sep, for_prompt=for_prompt), end=end, file=file)
 
     @staticmethod
-    def parse(*markup: str, customs: list[Callable|tuple[str,Callable]] | None = None, sep: str = " ", mar: bool = True) -> str:
+    def parse(
+        *markup: str,
+        customs: list[Callable|tuple[str,Callable]] | None = None,
+        sep: str = " ",
+        mar: bool = True,
+        for_prompt: bool = False,
+    ) -> str:
         """Parse in string markup and return the ansi encoded string.
             
         Args:
@@ -249,6 +303,8 @@ class Markup:
             sep (str): The seperator to use between each entry of `markdown`
             mar (bool): Markup auto reset (`mar`). If true then every markup entry is closed with a reset
                 ansi sequence, `\\x1b[0m`. 
+            for_prompt (bool): Wrap non printing sequences in `\\x01` and `\\x02` so readline
+                style prompts don't count them towards the line length.
             """
         customs = customs or []
 
@@ -259,5 +315,7 @@ class Markup:
             for text in markup[1:]:
                 parser.feed(text, sep=sep, mar=mar)
 
+            if for_prompt:
+                return mark_non_printing(str(parser))
             return str(parser)
         return ""
@@ -1,18 +1,25 @@
+from functools import lru_cache
 from typing import Literal
 
 from conterm.pretty.markup.color_consts import NamedColor
 
 class Color:
+    __slots__ = ("type", "value", "r", "g", "b", "_fg_", "_bg_")
+
     type: Literal["rgb", "hex", "xterm", "named"]
-    value: int = -1
-    r: int = -1
-    g: int = -1
-    b: int = -1
+    value: int
+    r: int
+    g: int
+    b: int
 
     def __init__(self, color: str) -> None:
+        self.value = -1
+        self.r = -1
+        self.g = -1
+        self.b = -1
         if color.startswith("#"):
             color = color.lstrip("#")
-            if len(color) not in [3, 6]:
+            if len(color) not in (3, 6):
                 raise ValueError(f"Expected hex value to have 3 to 6 digits: {len(color)} found")
             if len(color) == 3:
                 color = f"{color[0]*2}{color[1]*2}{color[2]*2}"
@@ -42,18 +49,41 @@ class Color:
                 self.b = named[1][2]
                 self.type = "named"
 
-    def __color__(self, code) -> str:
+        # Colors don't change once parsed so the sequences are built once. The type decides
+        # the format here instead of on every use
         if self.type == "xterm":
-            return f"{code}8;5;{self.value}"
-        if self.type in ["rgb", "hex", "named"]:
-            return f"{code}8;2;{self.r};{self.g};{self.b}"
-        return ""
+            channels = f"8;5;{self.value}"
+        else:
+            channels = f"8;2;{self.r};{self.g};{self.b}"
+        self._fg_ = f"3{channels}"
+        self._bg_ = f"4{channels}"
 
     def fg(self) -> str:
-        return self.__color__(3)
+        return self._fg_
 
     def bg(self) -> str:
-        return self.__color__(4)
+        return self._bg_
+
+    @staticmethod
+    def fg_of(color: str) -> str:
+        """Foreground sequence for a color string without keeping a `Color` around."""
+        return _sequences_(color)[0]
+
+    @staticmethod
+    def bg_of(color: str) -> str:
+        """Background sequence for a color string without keeping a `Color` around."""
+        return _sequences_(color)[1]
+
+@lru_cache(maxsize=4096)
+def _sequences_(color: str) -> tuple[str, str]:
+    """Foreground and background sequences for a color string. Markup reuses the same
+    colors so they are only parsed once. Invalid colors raise and aren't cached.
+
+    The size covers the full xterm palette along with the rgb preview table, which uses
+    a little over two thousand distinct colors.
+    """
+    parsed = Color(color)
+    return parsed._fg_, parsed._bg_
 
 if __name__ == "__main__":
     print(f"\x1b[{Color('#f43').fg()}mColored Text\x1b[0m")
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from enum import Enum
+from functools import lru_cache
 from os import get_terminal_size
-from re import sub
 from typing import Literal
 
 from .color import Color
@@ -13,6 +13,8 @@ from .util import Hyperlink, strip_ansi
 class Reset:
     """Extra state class for macros."""
 
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return "RESET"
 
@@ -58,27 +60,25 @@ MOD_SYMBOL_MAP = {
     "/s": "U_Strike",
 }
 
-def map_modifers(op: int, cl: int) -> list[str]:
+def _flag_values_(flags: int, values: dict[int, str]) -> list[str]:
+    """Values for each set flag in ascending order. Only set bits are visited."""
     result = []
-
-    for mod in ModifierOpen:
-        if mod.value & op and mod.value & cl == 0:
-            result.append(MOD_CODE_MAP[mod.name])
-    for mod in ModifierClose:
-        if mod.value & cl and mod.value & op == 0:
-            result.append(MOD_CODE_MAP[mod.name])
+    while flags:
+        flag = flags & -flags
+        result.append(values[flag])
+        flags ^= flag
     return result
 
-def map_modifer_names(op: int, cl: int) -> list[str]:
-    result = []
+def map_modifers(op: int, cl: int) -> list[str]:
+    # Flags that are both opened and closed cancel out
+    op, cl = op & ~cl, cl & ~op
+    if not (op or cl):
+        return []
+    return _flag_values_(op, MOD_OPEN_CODES) + _flag_values_(cl, MOD_CLOSE_CODES)
 
-    for mod in ModifierOpen:
-        if mod.value & op and mod.value & cl == 0:
-            result.append(mod.name)
-    for mod in ModifierClose:
-        if mod.value & cl and mod.value & op == 0:
-            result.append(mod.name.replace("U_", "/"))
-    return result
+def map_modifer_names(op: int, cl: int) -> list[str]:
+    op, cl = op & ~cl, cl & ~op
+    return _flag_values_(op, MOD_OPEN_NAMES) + _flag_values_(cl, MOD_CLOSE_NAMES)
 
 
 class ModifierOpen(Enum):
@@ -105,18 +105,39 @@ class ModifierClose(Enum):
     U_Reverse = 128
     U_Strike = 256
 
+# Code and name for each modifier flag. Iterating the enums touches `.value`, `.name` and
+# the code map for every modifier on every render
+MOD_OPEN_CODES = {mod.value: MOD_CODE_MAP[mod.name] for mod in ModifierOpen}
+MOD_CLOSE_CODES = {mod.value: MOD_CODE_MAP[mod.name] for mod in ModifierClose}
+MOD_OPEN_NAMES = {mod.value: mod.name for mod in ModifierOpen}
+MOD_CLOSE_NAMES = {mod.value: mod.name.replace("U_", "/") for mod in ModifierClose}
+
+# (open, close) flags for each modifier symbol so a modifier macro is a single lookup
+MOD_SYMBOL_FLAGS = {
+    symbol: (
+        (ModifierOpen[name].value, 0)
+        if name in ModifierOpen.__members__
+        else (0, ModifierClose[name].value)
+    )
+    for symbol, name in MOD_SYMBOL_MAP.items()
+}
+
 RESET = Reset()
+# Bound once so hot paths skip the class attribute lookup
+LINK_OPEN = Hyperlink.open
+LINK_CLOSE = Hyperlink.close
 CustomMacros = dict[str, Callable[[str], str]]
 
 def diff_url(current, other):
     """Diff URL."""
-    if isinstance(current, str) and not isinstance(other, str):
-        return current
-    if current == RESET and isinstance(other, str):
+    # Urls are None, RESET or a link so identity checks decide every case
+    if current is None:
+        return None
+    if current is RESET:
+        return RESET if other is not None and other is not RESET else None
+    if other is None or other is RESET:
         return current
-    if isinstance(current, str) and isinstance(other, str):
-        return f"{Hyperlink.close}{current}"
-    return None
+    return f"{LINK_CLOSE}{current}"
 
 def diff_align(new, old):
     if new != old:
@@ -129,14 +150,17 @@ def diff_align(new, old):
 def diff_color(new, old):
     """Diff color."""
     # None, Reset, Set
-    if isinstance(new, str) and len(new) > 0:
-        return new
-    if new == RESET and isinstance(old, str):
-        return RESET
-    return None
+    if new is None:
+        return None
+    if new is RESET:
+        return RESET if old is not None and old is not RESET else None
+    return new or None
 
 class Align:
     """ Alignment of text with width. """
+
+    __slots__ = ("_width_", "_align_")
+
     def __init__(self, width: str = "0", align: Literal["<", "^", ">"] = "<"):
         twidth = get_terminal_size()[0]
 
@@ -154,33 +178,31 @@ class Align:
         return f"{self._align_}{self._width_}"
 
     def __eq__(self, other: Align) -> bool:
-        if other is not None and other != RESET:
+        if other is not None and other is not RESET:
             return self._width_ == other._width_ and self._align_ == other._align_
         return False
 
     def apply(self, text: str, macro: Macro | None = None, url: str | None = None) -> str:
         """Apply alignment."""
 
-        nt = strip_ansi(text)
-        actual = len(nt)
-        remain = ((self._width_ - actual) // 2)
-        p1 = " " * remain
-        p2 = " " * (self._width_ - actual - remain)
+        pad = self._width_ - len(strip_ansi(text))
         
         style = str(macro) if macro is not None else ''
         reset = f"\x1b[0m"
         if url is not None:
-            if url != RESET:
+            if url is not RESET:
                 style += url
             else:
-                reset += Hyperlink.close
+                reset += LINK_CLOSE
 
+        # Only centering splits the padding, the other alignments pad one side
         if self._align_ == "<":
-            return f"{text}{reset}{p1 + p2}{style}"
+            return f"{text}{reset}{' ' * pad}{style}"
         elif self._align_ == "^":
-            return f"{reset}{p1}{text}{reset}{p2}{style}"
+            remain = pad // 2
+            return f"{reset}{' ' * remain}{text}{reset}{' ' * (pad - remain)}{style}"
         elif self._align_ == ">":
-            return f"{reset}{p1 + p2}{style}{text}"
+            return f"{reset}{' ' * pad}{style}{text}"
 
         return text
 
@@ -198,12 +220,17 @@ class Macro:
         "pop",
         "mod_open",
         "mod_close",
+        "_ansi_",
     )
 
     def __init__(self, macro: str = ""):
-        self.macro = sub(" +", " ", macro)
+        # Collapse repeated spaces. Splitting on a single space leaves empty strings for
+        # each extra space which are dropped
+        self.macro = " ".join(filter(None, macro.split(" ")))
 
-        self.customs = []
+        # Custom macro names. A dict keeps them unique while preserving the order they
+        # were written in, which decides the order inserts are applied
+        self.customs: dict[str, None] = {}
         self.align = None
         self.stash = False
         self.pop = False
@@ -212,11 +239,22 @@ class Macro:
         self.url = None
         self.fg = None
         self.bg = None
+        # Rendered sequence, built on first use. Macros are only modified while they are
+        # being built so it doesn't go stale
+        self._ansi_ = None
+
+        # Blank macros are created for every combined or diffed macro, they have nothing
+        # to parse
+        if not macro:
+            return
 
         macros = self.macro.lstrip("[").rstrip("]").split(" ")
 
+        # Empty pieces, like the one from a blank macro, would only be tried as a color
+        # which raises and is ignored
         for macro in macros:
-            self.__parse_macro__(macro)
+            if macro:
+                self.__parse_macro__(macro)
 
     def __full_reset_macro__(self):
         self.url = RESET
@@ -238,34 +276,38 @@ class Macro:
         elif macro == "/~":
             self.url = RESET
 
+    def __parse_url_macro__(self, macro):
+        macro = macro[1:]
+        if len(macro) == 0:
+            raise ValueError("Expected url assignment")
+        self.url = LINK_OPEN(macro)
+
+    def __parse_align_macro__(self, macro):
+        try:
+            self.align = Align(macro[1:], macro[0])
+        except: pass
+
+    def __parse_bg_macro__(self, macro):
+        self.bg = Color.bg_of(macro[1:])
+
     def __parse_open_macro__(self, macro):
-        if macro.startswith("~"):
-            macro = macro[1:]
-            if len(macro) == 0:
-                raise ValueError("Expected url assignment")
-            self.url = Hyperlink.open(macro)
-        elif macro.startswith(("<", ">", "^")):
-            try:
-                self.align = Align(macro[1:], macro[0])
-            except: pass
+        # Prefixed macros are picked by their first character, anything else is a color
+        # or a custom macro
+        if (handler := OPEN_MACRO_PREFIXES.get(macro[:1])) is not None:
+            handler(self, macro)
         elif macro == "stash":
             self.stash = True
-        elif macro.startswith("@"):
-            self.bg = Color(macro[1:]).bg()
         else:
             try:
-                self.fg = Color(macro).fg()
+                self.fg = Color.fg_of(macro)
             except ValueError:
                 if macro.strip() != "":
-                    self.customs.append(macro)
+                    self.customs[macro] = None
 
     def __parse_macro__(self, macro):
-        if macro in MOD_SYMBOL_MAP:
-            macro = MOD_SYMBOL_MAP[macro]
-            if macro in ModifierClose.__members__:
-                self.mod_close |= ModifierClose[macro].value
-            elif macro in ModifierOpen.__members__:
-                self.mod_open|= ModifierOpen[macro].value
+        if (flags := MOD_SYMBOL_FLAGS.get(macro)) is not None:
+            self.mod_open |= flags[0]
+            self.mod_close |= flags[1]
         elif macro.startswith("/"):
             if len(macro) == 1:
                 self.__full_reset_macro__()
@@ -276,9 +318,9 @@ class Macro:
 
     def __add__(self, other: Macro) -> Macro:
         macro = Macro()
-        macro.customs = set([*self.customs, *other.customs])
+        macro.customs = self.customs | other.customs
         macro.url = other.url 
-        if other.url == RESET and self.url is None:
+        if other.url is RESET and self.url is None:
             macro.url = self.url
         macro.fg = other.fg or self.fg
         macro.bg = other.bg or self.bg
@@ -297,20 +339,22 @@ class Macro:
         macro.bg = diff_color(self.bg, old.bg)
         macro.align = self.align
 
-        for mod in ModifierOpen:
-            if mod.value & self.mod_open and mod.value & old.mod_open == 0:
-                macro.mod_open |= mod.value
-        for mod in ModifierClose:
-            if mod.value & self.mod_close and mod.value & old.mod_close == 0:
-                macro.mod_close |= mod.value
+        # Flags set here that weren't already set by the old macro
+        macro.mod_open = self.mod_open & ~old.mod_open
+        macro.mod_close = self.mod_close & ~old.mod_close
         return macro
 
     def __str__(self):
+        if self._ansi_ is None:
+            self._ansi_ = self.__render__()
+        return self._ansi_
+
+    def __render__(self) -> str:
         parts = []
         if self.fg is not None:
-            parts.append(self.fg if self.fg != RESET else "39")
+            parts.append(self.fg if self.fg is not RESET else "39")
         if self.bg is not None:
-            parts.append(self.bg if self.bg != RESET else "49")
+            parts.append(self.bg if self.bg is not RESET else "49")
 
         parts.extend(map_modifers(self.mod_open, self.mod_close))
 
@@ -318,8 +362,8 @@ class Macro:
         if len(parts) > 0:
             result = f"\x1b[{';'.join(parts)}m"
         if self.url is not None:
-            if self.url == RESET:
-                result += Hyperlink.close
+            if self.url is RESET:
+                result += LINK_CLOSE
             else:
                 result += self.url
         return result
@@ -342,3 +386,30 @@ class Macro:
             parts.append(f"custom=[{', '.join(self.customs)}]")
 
         return f"Macro({', '.join(parts)})"
+
+EMPTY_MACRO = Macro()
+"""Macro with nothing set. Used as the starting macro while parsing and never modified."""
+
+OPEN_MACRO_PREFIXES = {
+    "~": Macro.__parse_url_macro__,
+    "<": Macro.__parse_align_macro__,
+    ">": Macro.__parse_align_macro__,
+    "^": Macro.__parse_align_macro__,
+    "@": Macro.__parse_bg_macro__,
+}
+"""Parser for each open macro prefix character."""
+
+@lru_cache(maxsize=1024)
+def _cached_macro_(macro: str) -> Macro:
+    return Macro(macro)
+
+def parse_macro(macro: str) -> Macro:
+    """Get the macro for the macro's source string. Parsed macros are shared between calls
+    since they aren't modified after they are parsed, combining macros creates new ones.
+
+    Alignment macros are always parsed fresh since their width can depend on the current
+    terminal size.
+    """
+    if "<" in macro or ">" in macro or "^" in macro:
+        return Macro(macro)
+    return _cached_macro_(macro)
@@ -1,3 +1,9 @@
+from functools import cache
+
+ROW_BREAK = "[/]\n[^full]"
+"""Reset the row then start a new full width row."""
+
+@cache
 def xterm_colors() -> str:
     """Generate a xterm color table using the markup module.
 
@@ -5,33 +11,34 @@ def xterm_colors() -> str:
         Markup of xterm colors
     """
 
-    output = "[^full]"
+    parts = ["[^full]"]
     for i in range(8):
-        output += f"[{i}]▀"
-    output += "    " 
+        parts.append(f"[{i}]▀")
+    parts.append("    ")
     for i in range(8, 16):
-        output += f"[{i}]▀"
+        parts.append(f"[{i}]▀")
 
-    output += "[^full]"
-    for color in range(23):
-        output += f"[{232 + color} @{min(232 + color + 1, 255)}]▀"
-    output += "[/]\n\n"
+    parts.append("[^full]")
+    # Background is the next gray, the last one is 232 + 22 + 1 = 255 so it never
+    # needs clamping
+    for color in range(232, 255):
+        parts.append(f"[{color} @{color + 1}]▀")
+    parts.append("[/]\n\n")
 
     cursor = 16
-    output += "[^full]"
+    parts.append("[^full]")
     for _ in range(1, 4):
-        for column in range(37):
-            if column == 36:
-                continue
-            output += f"[{cursor + column} @{cursor + column + 36}]▀"
-        output += "[/]\n[^full]"
+        for color in range(cursor, cursor + 36):
+            parts.append(f"[{color} @{color + 36}]▀")
+        parts.append(ROW_BREAK)
         cursor += 72
         if cursor > 232:
             break
-    output += "[/]"
+    parts.append("[/]")
 
-    return output
+    return "".join(parts)
 
+@cache
 def system_colors() -> str:
     """Generate a system color table using the markup module.
 
@@ -43,6 +50,7 @@ def system_colors() -> str:
 
     return output
 
+@cache
 def rgb_colors() -> str:
     """Generate a rgb color table using the markup module.
     Returns:
@@ -58,17 +66,17 @@ def rgb_colors() -> str:
     height = width // 2
 
     step = 255 // width
-    output = "[^full]"
+    parts = ["[^full]"]
 
     for _ in range(height):
         for _ in range(width):
             red -= step
             blue += step
-            output += f"[{red},{green},{blue} @{red},{green+step},{blue}]▀"
-        output += "[/]\n[^full]"
+            parts.append(f"[{red},{green},{blue} @{red},{green+step},{blue}]▀")
+        parts.append(ROW_BREAK)
         red = 255
         blue = 0
         green += step * 2
-    output += "[/]"
+    parts.append("[/]")
 
-    return output
+    return "".join(parts)
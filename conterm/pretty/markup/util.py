@@ -1,16 +1,39 @@
 import re
+from functools import lru_cache
 
+NON_PRINTING = re.compile(r"(\x1b\[[0-9;]*m|\x1b]8;;[^\x1b]*\x1b\\)")
+"""Ansi style and hyperlink sequences that take up no space when printed."""
+ANSI = re.compile(
+    r"\x1b\[[<?]?(?:(?:\d{1,3};?)*)[a-zA-Z~]|\x1b]\d;;[^\x1b]*\x1b\\|[\x00-\x1B]",
+    re.ASCII,
+)
+"""Control sequences, hyperlink opening and closing tags, and raw control characters.
+Sequence parameters are only ever ascii digits."""
+
+@lru_cache(maxsize=128)
+def _open_link_(link: str) -> str:
+    """Create the opening to a hypertext link. The same links tend to be used many times
+    while parsing markup so they are cached."""
+    return f"\x1b]8;;{link}\x1b\\"
 
 class Hyperlink:
     """Helper class for building hyperlink in terminal terminals."""
 
+    __slots__ = ()
+
     close = "\x1b]8;;\x1b\\"
     """Get the closer for a hypertext link."""
 
-    @staticmethod
-    def open(link: str) -> str:
-        """Create the opening to a hypertext link."""
-        return f"\x1b]8;;{link}\x1b\\"
+    # The cached function is used directly so opening a link is a single call
+    open = staticmethod(_open_link_)
+
+def mark_non_printing(ansi: str) -> str:
+    """Wrap every non printing sequence in `\\x01` and `\\x02`.
+
+    Readline based prompts use these markers to leave the sequences out of the
+    prompt's length so the cursor and line wrapping stay correct.
+    """
+    return NON_PRINTING.sub("\x01\\1\x02", ansi)
 
 def strip_ansi(ansi: str = ""):
     """Strip ansi code from a string."""
@@ -18,8 +41,8 @@ def strip_ansi(ansi: str = ""):
     # First check for control sequences. This covers most sequences, but some may slip through
     # Then check for Link opening and closing tags: \x1b]8;;<link>\x1b\ or \x1b]8;;\x1b\
     # Finally check for any raw characters like \x04 == ctrl+d
-    return re.sub(
-        r"\x1b\[[<?]?(?:(?:\d{1,3};?)*)[a-zA-Z~]|\x1b]\d;;[^\x1b]*\x1b\\|[\x00-\x1B]",
-        "",
-        ansi,
-    )
+    # Everything the regex removes starts with a control character. Text without any is
+    # returned as is, `isprintable` scans it in C
+    if ansi.isprintable():
+        return ansi
+    return ANSI.sub("", ansi)